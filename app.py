@@ -1,49 +1,250 @@
 # app.py
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, stream_with_context, g, got_request_exception
 from flask_cors import CORS
-from datetime import datetime
-import random
-
-from merit_engine import calculate_merit_debt_profile, calculate_yin_burden_from_bazi
+from datetime import timedelta
+import hashlib
+from itertools import islice
+import os
+import sys
+from time import perf_counter
+
+from merit_engine import calculate_merit_debt_profile, calculate_yin_burden_from_bazi, warm_yin_burden_profiles
+import bazi_core
 from bazi_core import compute_placeholder_bazi, describe_bazi_chart
-from elemental_blueprint_engine import generate_elemental_blueprint
-from current_phase_engine import generate_current_phase_reading
+from datetime_parser import parse_datetime_flex
+from elemental_blueprint_engine import get_rendered_blueprint
+import current_phase_engine
+from current_phase_engine import get_rendered_reading_for_key, reading_key, reading_expires
+from da_yun_engine import get_rendered_da_yun, parse_gender
+from date_search_engine import MAX_SEARCH_RESULTS, POSITIONS, iter_date_matches, parse_relations
+from energy_calendar_engine import MAX_CALENDAR_DAYS, get_rendered_calendar
+from flow_timeline_engine import RESOLUTIONS, flow_terms, iter_flow_timeline_json
+from reverse_lookup_engine import find_birth_windows, parse_pillar
+from profile_engine import CHART_SECTIONS, ProfileContext, build_profile, parse_sections
+from bulk_engine import iter_bulk_results
+from json_fragments import JSON_PROVIDERS
+import metrics
+import request_profiler
+import stage_timing
+from stage_timing import timed
 
 app = Flask(__name__)
 
 # -------------------------------------------------------------
 # CORS FIX (allow local file:// and frontend JS)
 # -------------------------------------------------------------
-CORS(app, resources={r"/*": {"origins": "*"}})
+CORS(app, resources={r"/*": {"origins": "*"}}, expose_headers=["ETag", "X-Total-Count"])
 
 
 # -------------------------------------------------------------
-# Flexible date + time parser
+# Flexible date + time parser (DD/MM/YYYY or YYYY-MM-DD, HH:MM)
 # -------------------------------------------------------------
-def _parse_datetime_flex(dob_str: str, tob_str: str | None = None):
-    if not dob_str:
-        return None
+_parse_datetime_flex = timed("parse")(parse_datetime_flex)
 
-    dt = None
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
-        try:
-            dt = datetime.strptime(dob_str, fmt)
-            break
-        except ValueError:
-            continue
 
-    if dt is None:
+# -------------------------------------------------------------
+# Pre-encoded JSON responses
+# (same bytes jsonify produces outside debug mode: sorted keys, compact)
+# -------------------------------------------------------------
+app.json = JSON_PROVIDERS[os.environ.get("BAZI_JSON_PROVIDER", "fragments")](app)
+app.json.dumps = timed("encode")(app.json.dumps)
+
+
+def _encode_json(obj) -> bytes:
+    return app.json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_bytes_response(body: bytes):
+    return app.response_class(body + b"\n", mimetype=app.json.mimetype)
+
+
+def _request_data():
+    """Input fields: query string for GET, JSON body otherwise."""
+    if request.method == "GET":
+        return request.args
+    return request.get_json(silent=True) or {}
+
+
+# -------------------------------------------------------------
+# Stage timing (BAZI_TIMING=1): Server-Timing header per response,
+# latency histograms per endpoint + stage (stage_timing)
+# -------------------------------------------------------------
+if stage_timing.ENABLED:
+    @app.before_request
+    def _start_stage_timing():
+        stage_timing.start_request()
+
+    @app.after_request
+    def _finish_stage_timing(response):
+        endpoint = request.endpoint or "unmatched"
+        stages = stage_timing.finish_request(endpoint)
+        if stages:
+            response.headers["Server-Timing"] = stage_timing.server_timing_header(stages)
+            if metrics.ENABLED:
+                metrics.observe_stages(endpoint, stages)
+        return response
+
+
+# -------------------------------------------------------------
+# Request metrics (BAZI_METRICS=0 disables): counts by status,
+# latency histograms and unhandled exceptions per endpoint, served
+# from /metrics for the whole gunicorn instance (metrics.py)
+# -------------------------------------------------------------
+if metrics.ENABLED:
+    @app.before_request
+    def _start_request_metrics():
+        g.request_started = perf_counter()
+
+    @app.after_request
+    def _finish_request_metrics(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            metrics.observe_request(
+                request.endpoint or "unmatched",
+                request.method,
+                response.status_code,
+                perf_counter() - started,
+            )
+        return response
+
+    def _count_engine_error(sender, exception, **extra):
+        metrics.observe_error(request.endpoint or "unmatched", exception)
+
+    got_request_exception.connect(_count_engine_error, app)
+
+    @app.route("/metrics")
+    def prometheus_metrics():
+        body, content_type = metrics.render()
+        return app.response_class(body, content_type=content_type)
+
+
+# -------------------------------------------------------------
+# Request profiling (BAZI_PROFILE_RATE / BAZI_ADMIN_TOKEN): cProfile or
+# stack samples per endpoint, read back from /admin/profile
+# (request_profiler.py)
+# -------------------------------------------------------------
+if request_profiler.ENABLED:
+    @app.before_request
+    def _start_profiling():
+        if request_profiler.should_profile(request.headers.get(request_profiler.PROFILE_HEADER)):
+            g.profile_session = request_profiler.start(request.endpoint or "unmatched")
+
+    @app.teardown_request
+    def _finish_profiling(exc):
+        session = g.pop("profile_session", None)
+        if session is not None:
+            session.finish()
+
+
+if request_profiler.ADMIN_TOKEN:
+    @app.route("/admin/profile", methods=["GET", "DELETE"])
+    def admin_profile():
+        if not request_profiler.is_admin(request.headers.get(request_profiler.ADMIN_HEADER)):
+            return jsonify({"error": "forbidden"}), 403
+
+        if request.method == "DELETE":
+            request_profiler.reset()
+            return jsonify({"status": "reset"})
+
+        endpoint = request.args.get("endpoint") or None
+        fmt = request.args.get("format", "summary")
+
+        if fmt == "summary":
+            return jsonify(request_profiler.summary())
+        if fmt == "text":
+            try:
+                limit = int(request.args.get("limit", 50))
+                report = request_profiler.pstats_text(endpoint, request.args.get("sort", "cumulative"), limit)
+            except (ValueError, KeyError) as e:
+                return jsonify({"error": f"Invalid sort/limit: {e}"}), 400
+            return app.response_class(report, mimetype="text/plain")
+        if fmt == "pstats":
+            return app.response_class(
+                request_profiler.pstats_dump(endpoint),
+                mimetype="application/octet-stream",
+                headers={"Content-Disposition": f"attachment; filename={endpoint or 'all'}.pstats"},
+            )
+        if fmt == "collapsed":
+            return app.response_class(request_profiler.collapsed_stacks(endpoint), mimetype="text/plain")
+        return jsonify({"error": "format must be summary, text, pstats or collapsed"}), 400
+
+
+# -------------------------------------------------------------
+# HTTP caching
+#
+# Every response is a pure function of the input echo, the chart and
+# the engine code, so ETags are derived from those (not from the body)
+# and If-None-Match is answered before any engine runs. Current-phase
+# readings also depend on the evaluation date: their ETag includes the
+# reading key, and max-age runs until the reading can next change.
+# -------------------------------------------------------------
+CHART_MAX_AGE = int(os.environ.get("BAZI_CHART_MAX_AGE", 86400))
+
+
+def _engine_version() -> str:
+    """Digest of the code and solar term table behind every response."""
+    digest = hashlib.sha256()
+    for module in (
+        bazi_core,
+        sys.modules["merit_engine"],
+        sys.modules["elemental_blueprint_engine"],
+        current_phase_engine,
+        sys.modules["da_yun_engine"],
+        sys.modules["flow_timeline_engine"],
+        sys.modules["energy_calendar_engine"],
+        sys.modules["date_search_engine"],
+        sys.modules["reverse_lookup_engine"],
+        sys.modules["profile_engine"],
+        sys.modules["datetime_parser"],
+    ):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    with open(__file__, "rb") as f:
+        digest.update(f.read())
+    digest.update(bazi_core.SOLAR_TERMS.minutes)
+    return digest.hexdigest()[:16]
+
+
+ENGINE_VERSION = os.environ.get("BAZI_ENGINE_VERSION") or _engine_version()
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.sha256(ENGINE_VERSION.encode("ascii"))
+    for part in parts:
+        digest.update(b"\x1f")
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def _conditional(etag: str, max_age: int, build):
+    """304 if If-None-Match matches etag (GET or POST), else build()."""
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
+
+def _parse_as_of(as_of_date, as_of_time):
+    """Explicit evaluation datetime from as_of / as_of_time; None if invalid."""
+    if not isinstance(as_of_date, str) or not isinstance(as_of_time, (str, type(None))):
         return None
+    return _parse_datetime_flex(as_of_date, as_of_time)
 
-    if tob_str:
-        try:
-            t = datetime.strptime(tob_str, "%H:%M")
-            dt = dt.replace(hour=t.hour, minute=t.minute)
-        except ValueError:
-            pass
 
-    return dt
+def _evaluation_time(as_of):
+    """
+    (time to evaluate current-phase at, max-age). Without an explicit
+    as_of: now, cacheable until the reading can next change.
+    """
+    if as_of is not None:
+        return as_of, CHART_MAX_AGE
+    now = current_phase_engine.clock()
+    return now, max(0, int((reading_expires(now) - now).total_seconds()))
 
 
 # -------------------------------------------------------------
@@ -60,7 +261,14 @@ def home():
             "/elemental-blueprint",
             "/yin-burden-bazi",
             "/bazi_decades",
-            "/current-phase"
+            "/current-phase",
+            "/profile",
+            "/flow-timeline",
+            "/flow-timeline/stream",
+            "/energy-calendar",
+            "/auspicious-dates",
+            "/reverse-lookup",
+            "/bulk"
         ]
     })
 
@@ -68,9 +276,9 @@ def home():
 # -------------------------------------------------------------
 # Original Merit Ledger (non-BaZi)
 # -------------------------------------------------------------
-@app.route("/yin-burden", methods=["POST"])
+@app.route("/yin-burden", methods=["GET", "POST"])
 def yin_burden():
-    data = request.get_json(silent=True) or {}
+    data = _request_data()
     dob_str = data.get("date_of_birth")
 
     if not dob_str:
@@ -80,20 +288,21 @@ def yin_burden():
     if dob is None:
         return jsonify({"error": "Invalid date format"}), 400
 
-    profile = calculate_merit_debt_profile(dob)
+    echo = {"date_of_birth": dob_str}
+    etag = _etag("yin-burden", _encode_json(echo))
 
-    return jsonify({
-        "input": {"date_of_birth": dob_str},
-        "merit_debt": profile
-    })
+    return _conditional(etag, CHART_MAX_AGE, lambda: jsonify({
+        "input": echo,
+        "merit_debt": calculate_merit_debt_profile(dob)
+    }))
 
 
 # -------------------------------------------------------------
 # BaZi Debug
 # -------------------------------------------------------------
-@app.route("/bazi-debug", methods=["POST"])
+@app.route("/bazi-debug", methods=["GET", "POST"])
 def bazi_debug():
-    data = request.get_json(silent=True) or {}
+    data = _request_data()
 
     dob_str = data.get("date_of_birth")
     if not dob_str:
@@ -106,24 +315,25 @@ def bazi_debug():
         return jsonify({"error": "Invalid date/time"}), 400
 
     chart = compute_placeholder_bazi(dt)
-    chart_dict = describe_bazi_chart(chart)
-
-    return jsonify({
-        "input": {
-            "date_of_birth": dob_str,
-            "time_of_birth": tob_str or "12:00 (default)"
-        },
-        "bazi_chart": chart_dict,
+    echo = {
+        "date_of_birth": dob_str,
+        "time_of_birth": tob_str or "12:00 (default)"
+    }
+    etag = _etag("bazi-debug", chart.key, _encode_json(echo))
+
+    return _conditional(etag, CHART_MAX_AGE, lambda: jsonify({
+        "input": echo,
+        "bazi_chart": describe_bazi_chart(chart),
         "note": "REAL Year/Month/Day/Hour BaZi logic used"
-    })
+    }))
 
 
 # -------------------------------------------------------------
 # Elemental Blueprint
 # -------------------------------------------------------------
-@app.route("/elemental-blueprint", methods=["POST"])
+@app.route("/elemental-blueprint", methods=["GET", "POST"])
 def elemental_blueprint():
-    data = request.get_json(silent=True) or {}
+    data = _request_data()
 
     dob_str = data.get("date_of_birth")
     if not dob_str:
@@ -136,23 +346,27 @@ def elemental_blueprint():
         return jsonify({"error": "Invalid date/time"}), 400
 
     chart = compute_placeholder_bazi(dt)
-    blueprint = generate_elemental_blueprint(chart)
+    blueprint = get_rendered_blueprint(chart)
 
-    return jsonify({
-        "input": {
-            "date_of_birth": dob_str,
-            "time_of_birth": tob_str or None
-        },
-        "blueprint": blueprint
+    # Blueprint JSON is pre-rendered; only the input echo is encoded here
+    input_json = _encode_json({
+        "date_of_birth": dob_str,
+        "time_of_birth": tob_str or None
     })
 
+    etag = f"{blueprint.etag}-{hashlib.sha256(input_json).hexdigest()[:16]}"
+
+    return _conditional(etag, CHART_MAX_AGE, lambda: _json_bytes_response(
+        b'{"blueprint":' + blueprint.json + b',"input":' + input_json + b"}"
+    ))
+
 
 # -------------------------------------------------------------
 # Yin Burden interpreted FROM BaZi
 # -------------------------------------------------------------
-@app.route("/yin-burden-bazi", methods=["POST"])
+@app.route("/yin-burden-bazi", methods=["GET", "POST"])
 def yin_burden_bazi():
-    data = request.get_json(silent=True) or {}
+    data = _request_data()
     dob_str = data.get("date_of_birth")
     tob_str = data.get("time_of_birth")
 
@@ -164,21 +378,21 @@ def yin_burden_bazi():
         return jsonify({"error": "Invalid date/time"}), 400
 
     chart = compute_placeholder_bazi(dt)
-    chart_dict = describe_bazi_chart(chart)
-    yin_profile = calculate_yin_burden_from_bazi(chart)
+    echo = {
+        "date_of_birth": dob_str,
+        "time_of_birth": tob_str
+    }
+    etag = _etag("yin-burden-bazi", chart.key, _encode_json(echo))
 
-    return jsonify({
-        "input": {
-            "date_of_birth": dob_str,
-            "time_of_birth": tob_str
-        },
-        "bazi_chart": chart_dict,
-        "yin_burden": yin_profile
-    })
+    return _conditional(etag, CHART_MAX_AGE, lambda: jsonify({
+        "input": echo,
+        "bazi_chart": describe_bazi_chart(chart),
+        "yin_burden": calculate_yin_burden_from_bazi(chart)
+    }))
 
 
 # -------------------------------------------------------------
-# Demo decade endpoint
+# Da Yun (luck pillar) timeline
 # -------------------------------------------------------------
 @app.route("/bazi_decades", methods=["GET"])
 def bazi_decades():
@@ -193,50 +407,32 @@ def bazi_decades():
     if dt is None:
         return jsonify({"error": "Invalid birth_date/birth_time"}), 400
 
-    seed = dt.year + dt.month + dt.day + dt.hour
-    rng = random.Random(seed)
-
-    base_year = dt.year
-    decades = []
-
-    for i in range(4):
-        start_year = base_year + i * 10
-        end_year = start_year + 9
-
-        love = rng.randint(60, 90)
-        wealth = rng.randint(60, 90)
-        career = rng.randint(60, 90)
-        health = rng.randint(60, 90)
-        overall = round((love + wealth + career + health) / 4)
-
-        decades.append({
-            "start": start_year,
-            "end": end_year,
-            "overall_luck": overall,
-            "love": love,
-            "wealth": wealth,
-            "career": career,
-            "health": health
-        })
+    try:
+        sex = parse_gender(gender)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify({
-        "input": {
-            "birth_date": birth_date,
-            "birth_time": birth_time,
-            "gender": gender
-        },
-        "chart_type": "demo_decade_profile",
-        "favorable_gods": ["食神", "偏财"],
-        "decades": decades
-    })
+    echo = {
+        "birth_date": birth_date,
+        "birth_time": birth_time,
+        "gender": gender
+    }
+    input_json = _encode_json(echo)
+    etag = _etag("bazi_decades", input_json)
+
+    # Timeline JSON is pre-rendered; only the input echo is encoded here
+    return _conditional(etag, CHART_MAX_AGE, lambda: _json_bytes_response(
+        b'{"chart_type":"da_yun","input":' + input_json
+        + b',"timeline":' + get_rendered_da_yun(dt, sex).json + b"}"
+    ))
 
 
 # -------------------------------------------------------------
 # Current Life Phase Reading
 # -------------------------------------------------------------
-@app.route("/current-phase", methods=["POST"])
+@app.route("/current-phase", methods=["GET", "POST"])
 def current_phase():
-    data = request.get_json(silent=True) or {}
+    data = _request_data()
 
     birth_date = data.get("birth_date")
     birth_time = data.get("birth_time")
@@ -248,16 +444,435 @@ def current_phase():
     if dt is None:
         return jsonify({"error": "Invalid birth_date/birth_time"}), 400
 
+    # Optional evaluation date (default: now)
+    as_of_date = data.get("as_of")
+    as_of_time = data.get("as_of_time")
+    as_of = None
+    if as_of_date:
+        as_of = _parse_as_of(as_of_date, as_of_time)
+        if as_of is None:
+            return jsonify({"error": "Invalid as_of/as_of_time"}), 400
+
+    # Optional gender (Da Yun direction; default male)
+    gender = data.get("gender")
+    try:
+        sex = parse_gender(gender)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    as_of, max_age = _evaluation_time(as_of)
     chart = compute_placeholder_bazi(dt)
-    reading = generate_current_phase_reading(chart, dt)
 
-    return jsonify({
-        "input": {
-            "birth_date": birth_date,
-            "birth_time": birth_time
-        },
-        "reading": reading
-    })
+    echo = {
+        "birth_date": birth_date,
+        "birth_time": birth_time
+    }
+    if as_of_date:
+        echo["as_of"] = as_of_date
+        echo["as_of_time"] = as_of_time
+    if gender:
+        echo["gender"] = gender
+
+    input_json = _encode_json(echo)
+    key = reading_key(chart, dt, as_of, sex)
+    etag = _etag("current-phase", *key, input_json)
+
+    # Reading JSON is pre-rendered; only the input echo is encoded here
+    return _conditional(etag, max_age, lambda: _json_bytes_response(
+        b'{"input":' + input_json + b',"reading":' + get_rendered_reading_for_key(key).json + b"}"
+    ))
+
+
+# -------------------------------------------------------------
+# Unified Profile (chart once, all engines)
+# -------------------------------------------------------------
+@app.route("/profile", methods=["GET", "POST"])
+def profile():
+    data = _request_data()
+
+    dob_str = data.get("date_of_birth") or data.get("birth_date")
+    tob_str = data.get("time_of_birth") or data.get("birth_time")
+
+    if not dob_str:
+        return jsonify({"error": "date_of_birth is required"}), 400
+
+    dt = _parse_datetime_flex(dob_str, tob_str)
+    if dt is None:
+        return jsonify({"error": "Invalid date/time"}), 400
+
+    try:
+        sections = parse_sections(data["sections"] if "sections" in data else request.args.get("sections"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    as_of_date = data.get("as_of")
+    as_of_time = data.get("as_of_time")
+    as_of = None
+    if as_of_date:
+        as_of = _parse_as_of(as_of_date, as_of_time)
+        if as_of is None:
+            return jsonify({"error": "Invalid as_of/as_of_time"}), 400
+
+    gender = data.get("gender")
+    try:
+        sex = parse_gender(gender)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    echo = {
+        "date_of_birth": dob_str,
+        "time_of_birth": tob_str,
+        "as_of": as_of_date,
+        "as_of_time": as_of_time,
+        "gender": gender,
+        "sections": list(sections)
+    }
+
+    # ETag inputs of the selected sections only (the chart is not
+    # computed for merit_debt alone)
+    ctx = ProfileContext(dt, as_of=as_of, gender=sex)
+    etag_parts = [_encode_json(echo)]
+    if any(name in CHART_SECTIONS for name in sections):
+        etag_parts.append(ctx.chart.key)
+    max_age = CHART_MAX_AGE
+    if "current_phase" in sections:
+        ctx.as_of, max_age = _evaluation_time(as_of)
+        etag_parts += ctx.reading_key
+
+    return _conditional(_etag("profile", *etag_parts), max_age, lambda: jsonify({
+        "input": echo,
+        "profile": build_profile(ctx, sections)
+    }))
+
+
+# -------------------------------------------------------------
+# Flow pillar timeline (流年 / 流月): paginated and streamed
+# -------------------------------------------------------------
+FLOW_TIMELINE_YEARS = 100
+FLOW_DEFAULT_PER_PAGE = 120
+FLOW_MAX_PER_PAGE = 1200
+FLOW_STREAM_BATCH = 100
+
+
+def _years_later(dt, years: int):
+    try:
+        return dt.replace(year=dt.year + years)
+    except ValueError:  # 29 Feb
+        return dt.replace(year=dt.year + years, day=28)
+
+
+def _flow_timeline_args(data):
+    """
+    (input echo, day master, term range) for a timeline request; raises
+    ValueError with the message for a 400.
+    """
+    dob_str = data.get("date_of_birth") or data.get("birth_date")
+    tob_str = data.get("time_of_birth") or data.get("birth_time")
+    if not dob_str:
+        raise ValueError("date_of_birth is required")
+
+    dt = _parse_datetime_flex(dob_str, tob_str)
+    if dt is None:
+        raise ValueError("Invalid date/time")
+
+    resolution = data.get("resolution") or "month"
+    if not isinstance(resolution, str) or resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+
+    from_str = data.get("from")
+    to_str = data.get("to")
+    start = _parse_datetime_flex(from_str, None) if from_str else dt
+    if start is None:
+        raise ValueError("Invalid from date")
+    end = _parse_datetime_flex(to_str, None) if to_str else _years_later(start, FLOW_TIMELINE_YEARS)
+    if end is None:
+        raise ValueError("Invalid to date")
+    if end <= start:
+        raise ValueError("to must be after from")
+
+    echo = {
+        "date_of_birth": dob_str,
+        "time_of_birth": tob_str,
+        "from": from_str,
+        "to": to_str,
+        "resolution": resolution
+    }
+    day_master = compute_placeholder_bazi(dt).day_master
+    return echo, day_master, flow_terms(start, end, resolution)
+
+
+def _positive_int(data, name: str, default: int, maximum: int = None) -> int:
+    value = data.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = 0
+    if value < 1 or (maximum is not None and value > maximum):
+        limit = f" and at most {maximum}" if maximum is not None else ""
+        raise ValueError(f"{name} must be a positive integer{limit}")
+    return value
+
+
+@app.route("/flow-timeline", methods=["GET", "POST"])
+def flow_timeline():
+    data = _request_data()
+    try:
+        echo, day_master, terms = _flow_timeline_args(data)
+        page = _positive_int(data, "page", 1)
+        per_page = _positive_int(data, "per_page", FLOW_DEFAULT_PER_PAGE, FLOW_MAX_PER_PAGE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    echo["page"] = page
+    echo["per_page"] = per_page
+    input_json = _encode_json(echo)
+    total = len(terms)
+    page_terms = terms[(page - 1) * per_page:page * per_page]
+    etag = _etag("flow-timeline", day_master, page_terms.start, page_terms.stop, terms.step, total, input_json)
+
+    # Entries are spliced from pre-encoded pieces (same bytes as jsonify)
+    def build():
+        entries = ",".join(iter_flow_timeline_json(day_master, page_terms)).encode("ascii")
+        return _json_bytes_response(
+            b'{"day_master":' + _encode_json(day_master)
+            + b',"entries":[' + entries
+            + b'],"input":' + input_json
+            + b',"page":%d,"pages":%d,"per_page":%d,"resolution":' % (page, -(-total // per_page), per_page)
+            + _encode_json(echo["resolution"])
+            + b',"total":%d}' % total
+        )
+
+    return _conditional(etag, CHART_MAX_AGE, build)
+
+
+@app.route("/flow-timeline/stream", methods=["GET", "POST"])
+def flow_timeline_stream():
+    try:
+        echo, day_master, terms = _flow_timeline_args(_request_data())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = _etag("flow-timeline/stream", day_master, terms.start, terms.stop, terms.step, _encode_json(echo))
+
+    # One entry per line, generated lazily and sent FLOW_STREAM_BATCH lines at a time
+    def generate():
+        lines = iter_flow_timeline_json(day_master, terms)
+        while True:
+            batch = list(islice(lines, FLOW_STREAM_BATCH))
+            if not batch:
+                return
+            yield ("\n".join(batch) + "\n").encode("ascii")
+
+    def build():
+        response = app.response_class(generate(), mimetype="application/x-ndjson")
+        response.headers["X-Total-Count"] = str(len(terms))
+        return response
+
+    return _conditional(etag, CHART_MAX_AGE, build)
+
+
+# -------------------------------------------------------------
+# Daily energy calendar: each day's pillar and its relation to the
+# day master, as index arrays (shared by every chart whose day master
+# has the same element)
+# -------------------------------------------------------------
+CALENDAR_DEFAULT_DAYS = 365
+
+
+def _day_master_arg(data) -> str:
+    """
+    Day master from a `day_master` stem or the birth date/time; raises
+    ValueError with the message for a 400 (an invalid stem is reported
+    by the engine).
+    """
+    day_master = data.get("day_master")
+    if day_master:
+        if not isinstance(day_master, str):
+            raise ValueError("day_master must be a heavenly stem")
+        return day_master
+    dob_str = data.get("date_of_birth") or data.get("birth_date")
+    if not dob_str:
+        raise ValueError("date_of_birth or day_master is required")
+    dt = _parse_datetime_flex(dob_str, data.get("time_of_birth") or data.get("birth_time"))
+    if dt is None:
+        raise ValueError("Invalid date/time")
+    return compute_placeholder_bazi(dt).day_master
+
+
+def _start_date(value, name: str):
+    """(start date, max-age): the given date, or today, cacheable until midnight."""
+    if value:
+        start = _parse_datetime_flex(value, None)
+        if start is None:
+            raise ValueError(f"Invalid {name} date")
+        return start.date(), CHART_MAX_AGE
+    now = current_phase_engine.clock()
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return now.date(), int((midnight - now).total_seconds())
+
+
+@app.route("/energy-calendar", methods=["GET", "POST"])
+def energy_calendar():
+    data = _request_data()
+    try:
+        days = _positive_int(data, "days", CALENDAR_DEFAULT_DAYS, MAX_CALENDAR_DAYS)
+        day_master = _day_master_arg(data)
+        start, max_age = _start_date(data.get("start"), "start")
+        rendered = get_rendered_calendar(day_master, start, days)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    echo = {
+        "date_of_birth": data.get("date_of_birth") or data.get("birth_date"),
+        "time_of_birth": data.get("time_of_birth") or data.get("birth_time"),
+        "day_master": data.get("day_master"),
+        "start": data.get("start"),
+        "days": days
+    }
+    input_json = _encode_json(echo)
+    etag = _etag("energy-calendar", day_master, start.toordinal(), days, input_json)
+
+    return _conditional(etag, max_age, lambda: _json_bytes_response(
+        b'{"calendar":' + rendered.json
+        + b',"day_master":' + _encode_json(day_master)
+        + b',"input":' + input_json + b"}"
+    ))
+
+
+# -------------------------------------------------------------
+# Auspicious date search (择日): days in a window whose year / month /
+# day / hour pillars have the requested relations to the day master,
+# answered from inverted pillar indexes (date_search_engine)
+# -------------------------------------------------------------
+SEARCH_DEFAULT_LIMIT = 100
+
+
+@app.route("/auspicious-dates", methods=["GET", "POST"])
+def auspicious_dates():
+    data = _request_data()
+    try:
+        limit = _positive_int(data, "limit", SEARCH_DEFAULT_LIMIT, MAX_SEARCH_RESULTS)
+        filters = {position: parse_relations(data.get(position)) for position in POSITIONS}
+        day_master = _day_master_arg(data)
+        start, max_age = _start_date(data.get("from"), "from")
+        to_str = data.get("to")
+        end = _parse_datetime_flex(to_str, None) if to_str else None
+        if to_str and end is None:
+            raise ValueError("Invalid to date")
+        end = end.date() if end else _years_later(start, 1)
+        if end <= start:
+            raise ValueError("to must be after from")
+        matches = iter_date_matches(day_master, start, end, filters)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    echo = {
+        "date_of_birth": data.get("date_of_birth") or data.get("birth_date"),
+        "time_of_birth": data.get("time_of_birth") or data.get("birth_time"),
+        "day_master": data.get("day_master"),
+        "from": data.get("from"),
+        "to": data.get("to"),
+        "year": data.get("year"),
+        "month": data.get("month"),
+        "day": data.get("day"),
+        "hour": data.get("hour"),
+        "limit": limit
+    }
+    etag = _etag("auspicious-dates", day_master, start.toordinal(), end.toordinal(), _encode_json(echo))
+
+    # One match past the limit tells whether there are more
+    def build():
+        found = list(islice(matches, limit + 1))
+        return jsonify({
+            "input": echo,
+            "day_master": day_master,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "matches": found[:limit],
+            "count": min(len(found), limit),
+            "more": len(found) > limit
+        })
+
+    return _conditional(etag, max_age, build)
+
+
+# -------------------------------------------------------------
+# Reverse chart lookup: every birth datetime range (1900–2100) with
+# the given pillars; the hour pillar is optional
+# -------------------------------------------------------------
+@app.route("/reverse-lookup", methods=["GET", "POST"])
+def reverse_lookup():
+    data = _request_data()
+    try:
+        pillars = {}
+        for position in ("year", "month", "day"):
+            if not data.get(position):
+                raise ValueError("year, month and day pillars are required")
+            pillars[position] = parse_pillar(data.get(position))
+        pillars["hour"] = parse_pillar(data.get("hour")) if data.get("hour") else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    echo = {position: data.get(position) for position in ("year", "month", "day", "hour")}
+    etag = _etag("reverse-lookup", _encode_json(echo))
+
+    def build():
+        windows = find_birth_windows(**pillars)
+        return jsonify({
+            "input": echo,
+            "matches": [
+                {"start": start.isoformat(timespec="minutes"), "end": end.isoformat(timespec="minutes")}
+                for start, end in windows
+            ],
+            "count": len(windows)
+        })
+
+    return _conditional(etag, CHART_MAX_AGE, build)
+
+
+# -------------------------------------------------------------
+# Bulk NDJSON (one {date_of_birth, time_of_birth[, gender]} per line in,
+# one result per line out, streamed)
+# -------------------------------------------------------------
+@app.route("/bulk", methods=["POST"])
+def bulk():
+    try:
+        sections = parse_sections(request.args.get("sections") or "bazi_chart")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    as_of_date = request.args.get("as_of")
+    if as_of_date:
+        as_of = _parse_as_of(as_of_date, request.args.get("as_of_time"))
+        if as_of is None:
+            return jsonify({"error": "Invalid as_of/as_of_time"}), 400
+    else:
+        # One evaluation time for the whole upload
+        as_of = current_phase_engine.clock()
+
+    results = iter_bulk_results(request.stream, _parse_datetime_flex, sections, as_of)
+
+    def generate():
+        for result in results:
+            yield _encode_json(result) + b"\n"
+
+    return app.response_class(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+# -------------------------------------------------------------
+# Pre-fork warm-up (gunicorn.conf.py preloads the app and calls this in
+# the master): build everything that is otherwise filled in lazily, so
+# workers inherit it copy-on-write instead of each building their own.
+# -------------------------------------------------------------
+def warm_up() -> dict:
+    """Build lazily created tables and catalogs; returns their sizes."""
+    app.url_map.update()
+    return {
+        "yin_burden_profiles": warm_yin_burden_profiles(),
+        "readings": current_phase_engine.warm_reading_cache(),
+    }
 
 
 # -------------------------------------------------------------
@@ -0,0 +1,169 @@
+# bazi_batch.py
+# Purpose: compute many BaZi charts at once (nightly recomputes, bulk jobs).
+#
+# Same rules as bazi_core, written as vectorized modular arithmetic over
+# NumPy arrays (plus one searchsorted over the solar term table) instead
+# of one Pillar at a time.
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from bazi_core import (
+    HEAVENLY_STEMS,
+    EARTHLY_BRANCHES,
+    SOLAR_TERMS,
+    BaziChart,
+    sexagenary_index,
+)
+
+
+# ----------------------------------------
+# Lookup vectors
+# ----------------------------------------
+
+# Solar term start minutes (zero-copy view of the memory-mapped table)
+_TERM_MINUTES = np.frombuffer(SOLAR_TERMS.minutes, dtype=np.uint32)
+_TERM_EPOCH = np.datetime64(date.fromordinal(SOLAR_TERMS.epoch_ordinal), "D")
+
+# Outside the solar term table: solar month index (1=寅 .. 12=丑) by the
+# get_bazi_month_index fallback cutoffs: on/after the cutoff day → _MONTH_AFTER,
+# before → previous index
+_MONTH_CUTOFF = np.array([0, 6, 4, 6, 5, 6, 6, 7, 8, 8, 8, 8, 7], dtype=np.int8)
+_MONTH_AFTER = np.array([0, 12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11], dtype=np.int8)
+
+_DAY_ANCHOR = np.datetime64("1982-10-02", "D")
+_DAY_ANCHOR_STEM = HEAVENLY_STEMS.index("戊")
+_DAY_ANCHOR_BRANCH = EARTHLY_BRANCHES.index("午")
+
+
+# ----------------------------------------
+# Result container
+# ----------------------------------------
+
+@dataclass
+class BaziBatch:
+    """
+    Columnar charts: one int8 array per pillar stem / branch index
+    (HEAVENLY_STEMS / EARTHLY_BRANCHES positions).
+    """
+    year_stem: np.ndarray
+    year_branch: np.ndarray
+    month_stem: np.ndarray
+    month_branch: np.ndarray
+    day_stem: np.ndarray
+    day_branch: np.ndarray
+    hour_stem: np.ndarray
+    hour_branch: np.ndarray
+
+    def __len__(self):
+        return len(self.day_stem)
+
+    def pillar_indices(self):
+        """(year, month, day, hour) sexagenary index arrays (0..59)."""
+        def index(stems, branches):
+            return (6 * stems.astype(np.int64) - 5 * branches) % 60
+
+        return (
+            index(self.year_stem, self.year_branch),
+            index(self.month_stem, self.month_branch),
+            index(self.day_stem, self.day_branch),
+            index(self.hour_stem, self.hour_branch),
+        )
+
+    def keys(self) -> np.ndarray:
+        """Packed BaziChart.key per row (int64)."""
+        year, month, day, hour = self.pillar_indices()
+        return ((year * 60 + month) * 60 + day) * 60 + hour
+
+    def chart(self, i: int) -> BaziChart:
+        """Row i as a BaziChart (only that row is read)."""
+        return BaziChart.from_indices(
+            sexagenary_index(int(self.year_stem[i]), int(self.year_branch[i])),
+            sexagenary_index(int(self.month_stem[i]), int(self.month_branch[i])),
+            sexagenary_index(int(self.day_stem[i]), int(self.day_branch[i])),
+            sexagenary_index(int(self.hour_stem[i]), int(self.hour_branch[i])),
+        )
+
+    def to_charts(self) -> list:
+        """Convert back to BaziChart objects (same as compute_placeholder_bazi)."""
+        return [BaziChart.from_key(key) for key in self.keys().tolist()]
+
+
+# ----------------------------------------
+# Main batch entry
+# ----------------------------------------
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _as_minutes(datetimes) -> np.ndarray:
+    if isinstance(datetimes, np.ndarray) and datetimes.dtype.kind == "M":
+        return datetimes.astype("datetime64[m]").ravel()
+
+    # np.array(list_of_datetimes) goes through a slow per-object path;
+    # minute counts via toordinal() are several times faster.
+    minutes = np.fromiter(
+        ((dt.toordinal() - _EPOCH_ORDINAL) * 1440 + dt.hour * 60 + dt.minute for dt in datetimes),
+        dtype=np.int64,
+    )
+    return minutes.view("datetime64[m]")
+
+
+def compute_bazi_batch(datetimes) -> BaziBatch:
+    """
+    Vectorized compute_placeholder_bazi.
+
+    Input: sequence of naive datetimes, or a NumPy datetime64 array
+    Output: BaziBatch of int8 stem/branch index arrays
+    """
+    minutes = _as_minutes(datetimes)
+    days = minutes.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+
+    year = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = (months.astype(np.int64) % 12) + 1
+    day = (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+    minute_of_day = (minutes - days.astype("datetime64[m]")).astype(np.int64)
+    hour = minute_of_day // 60
+
+    # Year + month: one searchsorted over the solar term table
+    term_minute = (days - _TERM_EPOCH).astype(np.int64) * 1440 + minute_of_day
+    i = np.searchsorted(_TERM_MINUTES, term_minute, side="right") - 1
+    in_table = (i >= 0) & (i < len(_TERM_MINUTES) - 1)
+    number = SOLAR_TERMS.first_number + i
+
+    after = _MONTH_AFTER[month]
+    approx_month_index = np.where(day >= _MONTH_CUTOFF[month], after, (after - 2) % 12 + 1)
+
+    # Year pillar: (bazi_year - 4) % 10 / 12
+    year_base = np.where(in_table, number // 24, year) - 4
+    year_stem = year_base % 10
+    year_branch = year_base % 12
+
+    # Month pillar: solar month index + 寅月起干
+    month_index = np.where(in_table, (number % 24) // 2 + 1, approx_month_index)
+    start_stem = (2 * (year_stem % 5) + 2) % 10
+    month_stem = (start_stem + month_index - 1) % 10
+    month_branch = (month_index + 1) % 12
+
+    # Day pillar: anchored to 1982-10-02 = 戊午日
+    diff_days = (days - _DAY_ANCHOR).astype(np.int64)
+    day_stem = (_DAY_ANCHOR_STEM + diff_days) % 10
+    day_branch = (_DAY_ANCHOR_BRANCH + diff_days) % 12
+
+    # Hour pillar: 五鼠遁 + 2h branches
+    hour_branch = ((hour + 1) % 24) // 2
+    hour_stem = (2 * (day_stem % 5) + hour_branch) % 10
+
+    return BaziBatch(
+        year_stem=year_stem.astype(np.int8),
+        year_branch=year_branch.astype(np.int8),
+        month_stem=month_stem.astype(np.int8),
+        month_branch=month_branch.astype(np.int8),
+        day_stem=day_stem.astype(np.int8),
+        day_branch=day_branch.astype(np.int8),
+        hour_stem=hour_stem.astype(np.int8),
+        hour_branch=hour_branch.astype(np.int8),
+    )
@@ -1,6 +1,13 @@
 # bazi_core.py
-from dataclasses import dataclass
+import os
+import warnings
+from array import array
+from bisect import bisect_right
 from datetime import datetime, date
+from functools import lru_cache
+
+from solar_terms import SolarTermTable
+from stage_timing import timed
 
 # 10 Heavenly Stems
 HEAVENLY_STEMS = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
@@ -11,47 +18,208 @@ EARTHLY_BRANCHES = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申
 # Month branches always start from 寅月
 MONTH_BRANCH_SEQUENCE = ["寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥", "子", "丑"]
 
+# Stem → Element
+STEM_ELEMENT = {
+    "甲": "Wood", "乙": "Wood",
+    "丙": "Fire", "丁": "Fire",
+    "戊": "Earth", "己": "Earth",
+    "庚": "Metal", "辛": "Metal",
+    "壬": "Water", "癸": "Water",
+}
+
+# Branch → Element
+BRANCH_ELEMENT = {
+    "子": "Water", "亥": "Water",
+    "寅": "Wood", "卯": "Wood",
+    "巳": "Fire", "午": "Fire",
+    "申": "Metal", "酉": "Metal",
+    "辰": "Earth", "戌": "Earth", "丑": "Earth", "未": "Earth",
+}
+
+
+# ---------------------------
+# Sexagenary (60 甲子) index helpers
+# ---------------------------
+def sexagenary_index(stem_index: int, branch_index: int) -> int:
+    """
+    Position 0..59 of a stem/branch pair in the 甲子 cycle.
+    (甲子 = 0, 乙丑 = 1, ... 癸亥 = 59)
+    """
+    return (6 * stem_index - 5 * branch_index) % 60
+
 
-@dataclass
+# -------------------------------------------------------------
+# Pillar / Chart value types
+#
+# Only 60 pillars exist, so Pillar is a flyweight: Pillar(stem, branch)
+# always returns one of the 60 interned, immutable PILLARS instances
+# (string form and elements computed once).
+# -------------------------------------------------------------
 class Pillar:
-    stem: str
-    branch: str
+    __slots__ = ("index", "stem", "branch", "stem_element", "branch_element", "_text")
+
+    def __new__(cls, stem: str, branch: str):
+        try:
+            return _PILLAR_BY_PAIR[stem, branch]
+        except (KeyError, TypeError):
+            raise ValueError(f"Not a sexagenary pillar: {stem!r}, {branch!r}") from None
+
+    @classmethod
+    def _intern(cls, index: int):
+        self = object.__new__(cls)
+        stem = HEAVENLY_STEMS[index % 10]
+        branch = EARTHLY_BRANCHES[index % 12]
+        for name, value in (
+            ("index", index),
+            ("stem", stem),
+            ("branch", branch),
+            ("stem_element", STEM_ELEMENT[stem]),
+            ("branch_element", BRANCH_ELEMENT[branch]),
+            ("_text", stem + branch),
+        ):
+            object.__setattr__(self, name, value)
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Pillar is immutable")
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        return pillar_from_index, (self.index,)
+
+    def __hash__(self):
+        return self.index
 
     def __str__(self):
-        return f"{self.stem}{self.branch}"
+        return self._text
+
+    def __repr__(self):
+        return f"Pillar(stem={self.stem!r}, branch={self.branch!r})"
+
+
+PILLARS = tuple(Pillar._intern(i) for i in range(60))
+_PILLAR_BY_PAIR = {(p.stem, p.branch): p for p in PILLARS}
+
+
+def pillar_from_index(index: int) -> Pillar:
+    return PILLARS[index]
 
 
-@dataclass
 class BaziChart:
-    year: Pillar
-    month: Pillar
-    day: Pillar
-    hour: Pillar
-    day_master: str
+    """
+    Immutable, hashable four-pillar chart.
+
+    chart.key packs the four pillar indices into one int (0 .. 60**4 - 1),
+    a cheap canonical key for caches and stores.
+    """
+    __slots__ = ("year", "month", "day", "hour", "key")
+
+    def __init__(self, year: Pillar, month: Pillar, day: Pillar, hour: Pillar, day_master: str = None):
+        if day_master is not None and day_master != day.stem:
+            raise ValueError("day_master must be the day pillar stem")
+        setattr_ = object.__setattr__
+        setattr_(self, "year", year)
+        setattr_(self, "month", month)
+        setattr_(self, "day", day)
+        setattr_(self, "hour", hour)
+        setattr_(self, "key", ((year.index * 60 + month.index) * 60 + day.index) * 60 + hour.index)
+
+    @classmethod
+    def from_indices(cls, year: int, month: int, day: int, hour: int):
+        self = object.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(self, "year", PILLARS[year])
+        setattr_(self, "month", PILLARS[month])
+        setattr_(self, "day", PILLARS[day])
+        setattr_(self, "hour", PILLARS[hour])
+        setattr_(self, "key", ((year * 60 + month) * 60 + day) * 60 + hour)
+        return self
+
+    @classmethod
+    def from_key(cls, key: int):
+        key, hour = divmod(key, 60)
+        key, day = divmod(key, 60)
+        year, month = divmod(key, 60)
+        return cls.from_indices(year, month, day, hour)
+
+    @property
+    def day_master(self) -> str:
+        return self.day.stem
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BaziChart is immutable")
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        return BaziChart.from_key, (self.key,)
+
+    def __eq__(self, other):
+        if not isinstance(other, BaziChart):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self):
+        return self.key
+
+    def __repr__(self):
+        return (
+            f"BaziChart(year={self.year!r}, month={self.month!r}, day={self.day!r}, "
+            f"hour={self.hour!r}, day_master={self.day_master!r})"
+        )
 
 
 # -------------------------------------------------------------
-# Li Chun Table (Year → Month, Day) 1960–2040
+# Solar term (节气) table 1900–2100, minute precision (CST, UTC+8)
+#
+# Generated offline by solar_terms.py and memory-mapped here, so the
+# year (立春) and month (節) boundaries both come from one bisect.
+# Term number n = 24 * bazi_year + term id (立春 = 0, 惊蛰 = 2, ...).
 # -------------------------------------------------------------
-LI_CHUN_DATES = {
-    1960: (2, 4), 1961: (2, 4), 1962: (2, 4), 1963: (2, 4), 1964: (2, 5),
-    1965: (2, 4), 1966: (2, 4), 1967: (2, 4), 1968: (2, 5), 1969: (2, 4),
-    1970: (2, 4), 1971: (2, 4), 1972: (2, 5), 1973: (2, 4), 1974: (2, 4),
-    1975: (2, 4), 1976: (2, 5), 1977: (2, 4), 1978: (2, 4), 1979: (2, 4),
-    1980: (2, 5), 1981: (2, 4), 1982: (2, 4), 1983: (2, 4), 1984: (2, 4),
-    1985: (2, 4), 1986: (2, 4), 1987: (2, 4), 1988: (2, 4), 1989: (2, 4),
-    1990: (2, 4), 1991: (2, 4), 1992: (2, 4), 1993: (2, 4), 1994: (2, 4),
-    1995: (2, 4), 1996: (2, 4), 1997: (2, 4), 1998: (2, 4), 1999: (2, 4),
-    2000: (2, 4), 2001: (2, 4), 2002: (2, 4), 2003: (2, 4), 2004: (2, 4),
-    2005: (2, 4), 2006: (2, 4), 2007: (2, 4), 2008: (2, 4), 2009: (2, 4),
-    2010: (2, 4), 2011: (2, 4), 2012: (2, 4), 2013: (2, 4), 2014: (2, 4),
-    2015: (2, 4), 2016: (2, 4), 2017: (2, 3), 2018: (2, 4), 2019: (2, 4),
-    2020: (2, 4), 2021: (2, 3), 2022: (2, 4), 2023: (2, 4), 2024: (2, 4),
-    2025: (2, 3), 2026: (2, 4), 2027: (2, 4), 2028: (2, 4), 2029: (2, 4),
-    2030: (2, 3), 2031: (2, 4), 2032: (2, 4), 2033: (2, 4), 2034: (2, 4),
-    2035: (2, 3), 2036: (2, 4), 2037: (2, 4), 2038: (2, 4), 2039: (2, 4),
-    2040: (2, 3),
-}
+def _load_solar_terms() -> SolarTermTable:
+    try:
+        return SolarTermTable.load()
+    except FileNotFoundError:
+        warnings.warn("solar_terms.bin missing; computing solar terms in-process (run solar_terms.py)")
+        return SolarTermTable.build()
+
+
+SOLAR_TERMS = _load_solar_terms()
+_TERM_MINUTES = SOLAR_TERMS.minutes
+_TERM_FIRST_NUMBER = SOLAR_TERMS.first_number
+_TERM_EPOCH_ORDINAL = SOLAR_TERMS.epoch_ordinal
+_TERM_LAST_INDEX = len(_TERM_MINUTES) - 1
+
+
+def solar_term_number(dt: datetime):
+    """
+    Number of the solar term in effect at dt (24 * bazi_year + term id),
+    or None when dt is outside the table.
+    """
+    ordinal = dt.toordinal()
+    minute = (ordinal - _TERM_EPOCH_ORDINAL) * 1440 + dt.hour * 60 + dt.minute
+
+    offset = ordinal - _CALENDAR_BASE
+    if 0 <= offset < _CALENDAR_DAYS:
+        # Terms are ~15 days apart, so at most one starts during the day
+        i = DAY_TERM_TABLE[offset]
+        if minute >= _TERM_MINUTES[i + 1]:
+            i += 1
+    else:
+        i = bisect_right(_TERM_MINUTES, minute) - 1
+
+    if 0 <= i < _TERM_LAST_INDEX:
+        return _TERM_FIRST_NUMBER + i
+    return None
+
+
+def solar_term_start(number: int):
+    """Start (CST) of solar term `number` (24 * year + term id), or None."""
+    i = number - _TERM_FIRST_NUMBER
+    if 0 <= i <= _TERM_LAST_INDEX:
+        return SOLAR_TERMS.term_start(i)
+    return None
 
 
 # ---------------------------
@@ -61,16 +229,12 @@ def adjust_year_for_li_chun(dt: datetime) -> int:
     """
     If birth is before Li Chun of that year → use previous year.
     After Li Chun → use current year.
+    (Outside the solar term table: calendar year.)
     """
-    y = dt.year
-    if y not in LI_CHUN_DATES:
-        return y
-
-    m, d = LI_CHUN_DATES[y]
-    li_chun_dt = datetime(y, m, d, 0, 0)
-    if dt < li_chun_dt:
-        return y - 1
-    return y
+    number = solar_term_number(dt)
+    if number is None:
+        return dt.year
+    return number // 24
 
 
 # ---------------------------
@@ -97,6 +261,11 @@ def compute_year_pillar_basic(dt: datetime) -> Pillar:
 # REAL BaZi Month Index 1–12 (solar month)
 # ---------------------------
 def get_bazi_month_index(dt: datetime) -> int:
+    number = solar_term_number(dt)
+    if number is not None:
+        return (number % 24) // 2 + 1
+
+    # Outside the solar term table: approximate day-of-month cutoffs
     m = dt.month
     d = dt.day
 
@@ -254,39 +423,173 @@ def _stem_branch_from_int(seed: int) -> Pillar:
     return Pillar(stem, branch)
 
 
+# -------------------------------------------------------------
+# Precomputed calendar tables (1900-01-01 → 2100-12-31)
+#
+# Day pillar (0..59) per day, advancing one step per day from the
+# 1982-10-02 anchor; year and month pillars come from the solar
+# term table above.
+# -------------------------------------------------------------
+CALENDAR_START = date(1900, 1, 1)
+CALENDAR_END = date(2100, 12, 31)
+
+_CALENDAR_BASE = CALENDAR_START.toordinal()
+_CALENDAR_DAYS = CALENDAR_END.toordinal() - _CALENDAR_BASE + 1
+
+_DAY_ANCHOR_ORDINAL = date(1982, 10, 2).toordinal()
+_DAY_ANCHOR_INDEX = sexagenary_index(4, 6)  # 戊午
+
+_FIRST_DAY_INDEX = (_DAY_ANCHOR_INDEX + _CALENDAR_BASE - _DAY_ANCHOR_ORDINAL) % 60
+DAY_PILLAR_TABLE = (bytes(range(60)) * (_CALENDAR_DAYS // 60 + 2))[_FIRST_DAY_INDEX:_FIRST_DAY_INDEX + _CALENDAR_DAYS]
+
+
+def day_pillar_index(d: date) -> int:
+    """Sexagenary index of the day pillar of date d (any date, not only the table range)."""
+    return (_DAY_ANCHOR_INDEX + d.toordinal() - _DAY_ANCHOR_ORDINAL) % 60
+
+
+def _build_day_term_table():
+    # Index into SOLAR_TERMS of the term in effect at 00:00 of each day
+    table = array("H", bytes(2 * _CALENDAR_DAYS))
+    first_minute = (_CALENDAR_BASE - _TERM_EPOCH_ORDINAL) * 1440
+    for i in range(_TERM_LAST_INDEX):
+        lo = max(0, -((first_minute - _TERM_MINUTES[i]) // 1440))
+        hi = min(_CALENDAR_DAYS, -((first_minute - _TERM_MINUTES[i + 1]) // 1440))
+        if lo < hi:
+            table[lo:hi] = array("H", [i]) * (hi - lo)
+    return table
+
+
+DAY_TERM_TABLE = _build_day_term_table()
+
+
+def month_pillar_index(year_index: int, month_index: int) -> int:
+    # 寅月起干: 甲/己 → 丙, 乙/庚 → 戊, 丙/辛 → 庚, 丁/壬 → 壬, 戊/癸 → 甲
+    start_stem = (2 * (year_index % 5) + 2) % 10
+    stem_index = (start_stem + month_index - 1) % 10
+    branch_index = (month_index + 1) % 12
+    return sexagenary_index(stem_index, branch_index)
+
+
+# 五鼠遁: hour pillar by (day stem, hour branch) → HOUR_PILLAR_TABLE[stem * 12 + branch]
+HOUR_PILLAR_TABLE = bytes(
+    sexagenary_index((2 * (day_stem % 5) + hour_index) % 10, hour_index)
+    for day_stem in range(10)
+    for hour_index in range(12)
+)
+
+
+def hour_branch_index(hour: int) -> int:
+    # 23:00–00:59 → 子 (0), 01:00–02:59 → 丑 (1), etc.
+    return ((hour + 1) % 24) // 2
+
+
+def canonical_chart_key(dt: datetime):
+    """
+    Everything the chart depends on: (day offset, 2h hour slot, after_term),
+    where after_term says whether dt is past a solar term starting that day.
+    None outside CALENDAR_START..CALENDAR_END.
+    """
+    offset = dt.toordinal() - _CALENDAR_BASE
+    if not 0 <= offset < _CALENDAR_DAYS:
+        return None
+    minute = (offset + _CALENDAR_BASE - _TERM_EPOCH_ORDINAL) * 1440 + dt.hour * 60 + dt.minute
+    after_term = minute >= _TERM_MINUTES[DAY_TERM_TABLE[offset] + 1]
+    return offset, hour_branch_index(dt.hour), after_term
+
+
+def _pillar_indices_for_key(offset: int, hour_slot: int, after_term: bool):
+    number = _TERM_FIRST_NUMBER + DAY_TERM_TABLE[offset] + after_term
+    year_index = (number // 24 - 4) % 60
+    day_index = DAY_PILLAR_TABLE[offset]
+    return (
+        year_index,
+        month_pillar_index(year_index, (number % 24) // 2 + 1),
+        day_index,
+        HOUR_PILLAR_TABLE[(day_index % 10) * 12 + hour_slot],
+    )
+
+
+def compute_pillar_indices(dt: datetime):
+    """
+    (year, month, day, hour) pillars of dt as 0..59 sexagenary indices.
+
+    Solar term + calendar table lookups inside CALENDAR_START..CALENDAR_END,
+    the rule functions above outside of it.
+    """
+    key = canonical_chart_key(dt)
+    if key is None:
+        return tuple(p.index for p in _compute_pillars_by_rules(dt))
+    return _pillar_indices_for_key(*key)
+
+
+def _compute_pillars_by_rules(dt: datetime):
+    year_pillar = compute_year_pillar_basic(dt)
+    month_pillar = compute_month_pillar(dt, year_pillar)
+    day_pillar = compute_day_pillar_real(dt)
+    hour_pillar = compute_hour_pillar_real(dt, day_pillar)
+    return year_pillar, month_pillar, day_pillar, hour_pillar
+
+
+# -------------------------------------------------------------
+# Chart cache
+#
+# Bounded, thread-safe LRU (functools.lru_cache) keyed on the canonical
+# (day, hour slot, after_term) form, so every minute of a 2h window
+# shares one entry. Size via BAZI_CHART_CACHE_SIZE (0 disables).
+# -------------------------------------------------------------
+CHART_CACHE_SIZE = int(os.environ.get("BAZI_CHART_CACHE_SIZE", "16384"))
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _cached_chart(offset: int, hour_slot: int, after_term: bool) -> BaziChart:
+    return BaziChart.from_indices(*_pillar_indices_for_key(offset, hour_slot, after_term))
+
+
+def chart_cache_stats() -> dict:
+    """
+    lru_cache counters since start or the last clear_chart_cache().
+    lru_cache does not count evictions, so estimated_evictions is misses
+    minus entries held: it over-counts when concurrent misses on one key
+    insert it once.
+    """
+    info = _cached_chart.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "estimated_evictions": max(0, info.misses - info.currsize) if info.maxsize else 0,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
+
+
+def clear_chart_cache():
+    _cached_chart.cache_clear()
+
+
 # ---------------------------
 # Main entry currently used by app.py
 # (All four pillars now real, using our reference rules)
 # ---------------------------
+@timed("chart")
 def compute_placeholder_bazi(dt: datetime) -> BaziChart:
     """
     Current status:
-      - Year pillar: real (with Li Chun)
-      - Month pillar: real (solar month + 寅月起干)
+      - Year pillar: real (Li Chun to the minute)
+      - Month pillar: real (solar term month + 寅月起干)
       - Day pillar: real (anchored to 1982-10-02 = 戊午日)
       - Hour pillar: real (五鼠遁 + 2h branches)
-    """
-    # REAL year & month
-    year_pillar = compute_year_pillar_basic(dt)
-    month_pillar = compute_month_pillar(dt, year_pillar)
-
-    # REAL day pillar
-    day_pillar = compute_day_pillar_real(dt)
 
-    # REAL hour pillar
-    hour_pillar = compute_hour_pillar_real(dt, day_pillar)
-
-    day_master = day_pillar.stem
-
-    return BaziChart(
-        year=year_pillar,
-        month=month_pillar,
-        day=day_pillar,
-        hour=hour_pillar,
-        day_master=day_master,
-    )
+    Pillars are read from the solar term and calendar tables, through
+    the chart cache.
+    """
+    key = canonical_chart_key(dt)
+    if key is None:
+        return BaziChart.from_indices(*(p.index for p in _compute_pillars_by_rules(dt)))
+    return _cached_chart(*key)
 
 
+@timed("describe")
 def describe_bazi_chart(chart: BaziChart) -> dict:
     return {
         "year": str(chart.year),
@@ -0,0 +1,96 @@
+# benchmarks/endpoints.py
+# End-to-end throughput per route through the Flask test client: request
+# parsing, routing, engines, encoding and response hooks, without a
+# network or server in between. Current-phase runs against a fixed
+# clock (benchmarks.inputs.AS_OF).
+
+import json
+
+import current_phase_engine
+from app import app
+from bazi_core import compute_placeholder_bazi
+from datetime_parser import parse_datetime_flex
+
+from benchmarks.harness import benchmark
+from benchmarks.inputs import AS_OF, birth_strings
+
+POOL_SIZE = 200
+BULK_LINES = 500
+
+current_phase_engine.clock = lambda: AS_OF
+
+
+def _client():
+    return app.test_client()
+
+
+def _post_route(path: str, make_body):
+    @benchmark(f"endpoint.POST {path}")
+    def setup():
+        client = _client()
+        bodies = [make_body(dob, tob) for dob, tob in birth_strings(POOL_SIZE)]
+
+        def run():
+            for body in bodies:
+                client.post(path, json=body)
+
+        return run, len(bodies)
+
+    return setup
+
+
+def _get_route(path: str, make_query):
+    @benchmark(f"endpoint.GET {path}")
+    def setup():
+        client = _client()
+        queries = [make_query(dob, tob) for dob, tob in birth_strings(POOL_SIZE)]
+
+        def run():
+            for query in queries:
+                client.get(path, query_string=query)
+
+        return run, len(queries)
+
+    return setup
+
+
+def _dob(dob, tob):
+    return {"date_of_birth": dob, "time_of_birth": tob}
+
+
+def _birth(dob, tob):
+    return {"birth_date": dob, "birth_time": tob}
+
+
+def _birth_query(dob, tob):
+    return {"birth_date": dob, **({"birth_time": tob} if tob else {})}
+
+
+def _pillar_query(dob, tob):
+    chart = compute_placeholder_bazi(parse_datetime_flex(dob, tob))
+    return {"year": str(chart.year), "month": str(chart.month), "day": str(chart.day), "hour": str(chart.hour)}
+
+
+_post_route("/yin-burden", lambda dob, tob: {"date_of_birth": dob})
+_post_route("/bazi-debug", _dob)
+_post_route("/elemental-blueprint", _dob)
+_post_route("/yin-burden-bazi", _dob)
+_post_route("/current-phase", _birth)
+_post_route("/profile", _dob)
+_get_route("/current-phase", _birth_query)
+_get_route("/bazi_decades", _birth_query)
+_get_route("/flow-timeline", _birth_query)
+_get_route("/energy-calendar", _birth_query)
+_get_route("/reverse-lookup", _pillar_query)
+_get_route("/auspicious-dates", lambda dob, tob: {**_birth_query(dob, tob), "day": "resource", "month": "!pressure"})
+
+
+@benchmark("endpoint.POST /bulk (per line)")
+def _bulk():
+    client = _client()
+    body = "\n".join(json.dumps(_dob(dob, tob)) for dob, tob in birth_strings(BULK_LINES))
+
+    def run():
+        client.post("/bulk?sections=bazi_chart,current_phase", data=body).get_data()
+
+    return run, BULK_LINES
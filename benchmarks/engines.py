@@ -0,0 +1,151 @@
+# benchmarks/engines.py
+# Microbenchmarks: each engine entry point over the realistic birth-date
+# distribution (benchmarks.inputs). "cold" variants clear the engine's
+# memo first, "warm" ones measure the steady state.
+
+from itertools import islice
+
+import bazi_core
+import current_phase_engine
+from bazi_batch import compute_bazi_batch
+from bazi_core import compute_placeholder_bazi, clear_chart_cache
+from datetime_parser import parse_datetime_flex
+from elemental_blueprint_engine import generate_elemental_blueprint
+from merit_engine import calculate_merit_debt_profile, calculate_yin_burden_from_bazi
+from current_phase_engine import generate_current_phase_reading
+from da_yun_engine import clear_da_yun_cache, get_rendered_da_yun
+from energy_calendar_engine import energy_calendar
+from date_search_engine import iter_date_matches, parse_relations
+from reverse_lookup_engine import find_birth_windows, find_chart_windows
+
+from benchmarks.harness import benchmark
+from benchmarks.inputs import AS_OF, birth_datetimes, birth_strings
+
+POOL_SIZE = 2000
+
+
+def _charts(dts):
+    return [compute_placeholder_bazi(dt) for dt in dts]
+
+
+@benchmark("engine.parse_datetime_flex")
+def _parse():
+    pairs = birth_strings(POOL_SIZE)
+    return (lambda: [parse_datetime_flex(d, t) for d, t in pairs]), len(pairs)
+
+
+@benchmark("engine.compute_placeholder_bazi.cold")
+def _chart_cold():
+    dts = birth_datetimes(POOL_SIZE)
+
+    def run():
+        clear_chart_cache()
+        for dt in dts:
+            compute_placeholder_bazi(dt)
+
+    return run, len(dts)
+
+
+@benchmark("engine.compute_placeholder_bazi.warm")
+def _chart_warm():
+    dts = birth_datetimes(POOL_SIZE)
+    _charts(dts)
+    return (lambda: [compute_placeholder_bazi(dt) for dt in dts]), len(dts)
+
+
+@benchmark("engine.compute_pillar_indices")
+def _pillar_indices():
+    dts = birth_datetimes(POOL_SIZE)
+    return (lambda: [bazi_core.compute_pillar_indices(dt) for dt in dts]), len(dts)
+
+
+@benchmark("engine.compute_bazi_batch")
+def _batch():
+    dts = birth_datetimes(20000)
+    return (lambda: compute_bazi_batch(dts)), len(dts)
+
+
+@benchmark("engine.calculate_yin_burden_from_bazi")
+def _yin_burden():
+    charts = _charts(birth_datetimes(POOL_SIZE))
+    return (lambda: [calculate_yin_burden_from_bazi(c) for c in charts]), len(charts)
+
+
+@benchmark("engine.calculate_merit_debt_profile")
+def _merit_debt():
+    dts = birth_datetimes(POOL_SIZE)
+    return (lambda: [calculate_merit_debt_profile(dt) for dt in dts]), len(dts)
+
+
+@benchmark("engine.generate_elemental_blueprint")
+def _blueprint():
+    charts = _charts(birth_datetimes(POOL_SIZE))
+    return (lambda: [generate_elemental_blueprint(c) for c in charts]), len(charts)
+
+
+@benchmark("engine.generate_current_phase_reading.cold")
+def _reading_cold():
+    dts = birth_datetimes(POOL_SIZE)
+    charts = _charts(dts)
+    pairs = list(zip(charts, dts))
+
+    def run():
+        current_phase_engine._rendered_reading.cache_clear()
+        for chart, dt in pairs:
+            generate_current_phase_reading(chart, dt, as_of=AS_OF)
+
+    return run, len(pairs)
+
+
+@benchmark("engine.generate_current_phase_reading.warm")
+def _reading_warm():
+    dts = birth_datetimes(POOL_SIZE)
+    pairs = list(zip(_charts(dts), dts))
+    return (lambda: [generate_current_phase_reading(c, dt, as_of=AS_OF) for c, dt in pairs]), len(pairs)
+
+
+@benchmark("engine.get_rendered_da_yun.cold")
+def _da_yun_cold():
+    dts = birth_datetimes(POOL_SIZE)
+    _charts(dts)
+
+    def run():
+        clear_da_yun_cache()
+        for dt in dts:
+            get_rendered_da_yun(dt, "female")
+
+    return run, len(dts)
+
+
+@benchmark("engine.get_rendered_da_yun.warm")
+def _da_yun_warm():
+    dts = birth_datetimes(POOL_SIZE)
+    return (lambda: [get_rendered_da_yun(dt, "female") for dt in dts]), len(dts)
+
+
+@benchmark("engine.energy_calendar.365")
+def _energy_calendar():
+    charts = _charts(birth_datetimes(POOL_SIZE))
+    start = AS_OF.date()
+    return (lambda: [energy_calendar(c.day_master, start, 365) for c in charts]), len(charts)
+
+
+@benchmark("engine.iter_date_matches.5y")
+def _date_search():
+    charts = _charts(birth_datetimes(POOL_SIZE))
+    start = AS_OF.date()
+    end = start.replace(year=start.year + 5)
+    filters = {"day": parse_relations("resource"), "month": parse_relations("!pressure")}
+    return (lambda: [list(islice(iter_date_matches(c.day_master, start, end, filters), 100)) for c in charts]), len(charts)
+
+
+@benchmark("engine.find_chart_windows")
+def _reverse_lookup():
+    charts = _charts(birth_datetimes(POOL_SIZE))
+    return (lambda: [find_chart_windows(c) for c in charts]), len(charts)
+
+
+@benchmark("engine.find_birth_windows.no_hour")
+def _reverse_lookup_no_hour():
+    charts = _charts(birth_datetimes(POOL_SIZE))
+    return (lambda: [find_birth_windows(c.year, c.month, c.day) for c in charts]), len(charts)
@@ -0,0 +1,85 @@
+# benchmarks/harness.py
+# Benchmark registry, timing and baseline comparison used by
+# benchmarks.run.
+
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+
+# name → setup(); setup returns (fn, calls): fn() performs `calls` operations
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def measure(fn, calls: int, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Best-of-`repeat` time per operation. Each repeat runs fn enough times
+    to last at least min_time, so short benchmarks are not timer noise.
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time / repeat or number >= 1 << 20:
+            break
+        number *= 2
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return {
+        "us_per_op": best / (number * calls) * 1e6,
+        "ops_per_sec": number * calls / best,
+        "ops": number * calls,
+        "repeat": repeat,
+    }
+
+
+def run(names, repeat: int = 5, min_time: float = 0.2, log=None) -> dict:
+    results = {}
+    for name in names:
+        fn, calls = BENCHMARKS[name]()
+        results[name] = measure(fn, calls, repeat=repeat, min_time=min_time)
+        if log:
+            log(f"{name:48s} {results[name]['us_per_op']:10.2f} us/op")
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "clock": time.get_clock_info("perf_counter").implementation,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float):
+    """
+    Rows (name, baseline us/op, current us/op, ratio) for benchmarks in
+    both runs, and the names slower than baseline by more than threshold
+    (0.10 = 10%).
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]["us_per_op"]
+        after = current[name]["us_per_op"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
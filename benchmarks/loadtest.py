@@ -0,0 +1,412 @@
+# benchmarks/loadtest.py
+# Load generator: boots app:app locally (gunicorn, or a threaded werkzeug
+# server as a stand-in) or targets a running server, replays a weighted
+# mix of the seven routes with realistic payloads, and reports
+# throughput and p50/p95/p99 latency per route at each load step.
+#
+#   closed loop: N clients, each sends its next request as soon as the
+#                previous one returns (--concurrency 1,4,16,64)
+#   open loop:   Poisson arrivals at a fixed rate, latency measured from
+#                the scheduled send time so queueing is not hidden
+#                (--rate 200,400,800)
+#
+#   python -m benchmarks.loadtest --concurrency 1,4,16,64
+#   python -m benchmarks.loadtest --server gunicorn --worker-class gthread --threads 8 --mode open --rate 250,500,1000
+#   python -m benchmarks.loadtest --url http://127.0.0.1:5000 --mix current-phase=3,profile=1
+#
+# The generator runs in --procs processes so it is not limited to one
+# GIL; if an open-loop step reports "missed" arrivals, the generator
+# (not the server) could not keep up.
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.harness import metadata
+from benchmarks.inputs import birth_strings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAYLOAD_POOL = 2000
+
+# route → (method, path, payload builder)
+ROUTES = {
+    "yin-burden": ("POST", "/yin-burden", lambda dob, tob: {"date_of_birth": dob}),
+    "bazi-debug": ("POST", "/bazi-debug", lambda dob, tob: {"date_of_birth": dob, "time_of_birth": tob}),
+    "elemental-blueprint": ("POST", "/elemental-blueprint", lambda dob, tob: {"date_of_birth": dob, "time_of_birth": tob}),
+    "yin-burden-bazi": ("POST", "/yin-burden-bazi", lambda dob, tob: {"date_of_birth": dob, "time_of_birth": tob}),
+    "bazi_decades": ("GET", "/bazi_decades", lambda dob, tob: {"birth_date": dob, **({"birth_time": tob} if tob else {})}),
+    "current-phase": ("POST", "/current-phase", lambda dob, tob: {"birth_date": dob, "birth_time": tob}),
+    "profile": ("POST", "/profile", lambda dob, tob: {"date_of_birth": dob, "time_of_birth": tob}),
+}
+
+DEFAULT_MIX = "current-phase=4,profile=2,elemental-blueprint=2,yin-burden-bazi=1,bazi-debug=1,yin-burden=1,bazi_decades=1"
+
+
+# ----------------------------------------
+# Request plan
+# ----------------------------------------
+
+def _requests_for(route: str):
+    method, path, build = ROUTES[route]
+    out = []
+    for dob, tob in birth_strings(PAYLOAD_POOL):
+        payload = build(dob, tob)
+        if method == "GET":
+            out.append((method, f"{path}?{urlencode(payload)}", None, {}))
+        else:
+            out.append((method, path, json.dumps(payload).encode(), {"Content-Type": "application/json"}))
+    return out
+
+
+class RequestPlan:
+    """Random (route, request) draws following the route weights."""
+
+    def __init__(self, mix, seed: int):
+        self.rng = random.Random(seed)
+        self.routes = [route for route, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.requests = {route: _requests_for(route) for route in self.routes}
+
+    def next(self):
+        route = self.rng.choices(self.routes, self.weights)[0]
+        return route, self.rng.choice(self.requests[route])
+
+
+def _send(conn, request) -> bool:
+    method, target, body, headers = request
+    try:
+        conn.request(method, target, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status < 500
+    except (OSError, http.client.HTTPException):
+        conn.close()
+        return False
+
+
+class _Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, route: str, seconds: float, ok: bool):
+        with self.lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+
+# ----------------------------------------
+# Generator processes
+# ----------------------------------------
+
+def _closed_loop(host, port, mix, clients, duration, warmup, seed):
+    recorder = _Recorder()
+    start = perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    def client(i):
+        plan = RequestPlan(mix, seed * 1000 + i)
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        while True:
+            t0 = perf_counter()
+            if t0 >= deadline:
+                break
+            route, request = plan.next()
+            ok = _send(conn, request)
+            if t0 >= measure_from:
+                recorder.record(route, perf_counter() - t0, ok)
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"latencies": recorder.latencies, "errors": recorder.errors, "missed": 0}
+
+
+def _open_loop(host, port, mix, rate, duration, warmup, seed, max_inflight):
+    recorder = _Recorder()
+    plan = RequestPlan(mix, seed)
+    arrivals = queue.Queue()
+    start = perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    give_up = deadline + 5.0
+    missed = 0
+
+    def worker():
+        nonlocal missed
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        while True:
+            item = arrivals.get()
+            if item is None:
+                break
+            scheduled, route, request = item
+            if perf_counter() > give_up:
+                with recorder.lock:
+                    missed += 1
+                continue
+            ok = _send(conn, request)
+            if scheduled >= measure_from:
+                recorder.record(route, perf_counter() - scheduled, ok)
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(max_inflight)]
+    for t in threads:
+        t.start()
+
+    rng = random.Random(seed + 1)
+    scheduled = start
+    while True:
+        scheduled += rng.expovariate(rate)
+        if scheduled >= deadline:
+            break
+        delay = scheduled - perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        route, request = plan.next()
+        arrivals.put((scheduled, route, request))
+
+    for _ in threads:
+        arrivals.put(None)
+    for t in threads:
+        t.join()
+    return {"latencies": recorder.latencies, "errors": recorder.errors, "missed": missed}
+
+
+def run_step(url, mix, mode, level, duration, warmup, procs, max_inflight):
+    host, port = _host_port(url)
+    with ProcessPoolExecutor(max_workers=procs) as pool:
+        if mode == "closed":
+            shares = [level // procs + (1 if i < level % procs else 0) for i in range(procs)]
+            futures = [
+                pool.submit(_closed_loop, host, port, mix, n, duration, warmup, seed=i + 1)
+                for i, n in enumerate(shares) if n
+            ]
+        else:
+            futures = [
+                pool.submit(_open_loop, host, port, mix, level / procs, duration, warmup,
+                            i + 1, max(1, max_inflight // procs))
+                for i in range(procs)
+            ]
+        parts = [f.result() for f in futures]
+    return _summarize(parts, duration)
+
+
+# ----------------------------------------
+# Reporting
+# ----------------------------------------
+
+def _percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def _stats(latencies, errors: int, duration: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput": len(values) / duration,
+        "p50_ms": _percentile(values, 50) * 1000,
+        "p95_ms": _percentile(values, 95) * 1000,
+        "p99_ms": _percentile(values, 99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+def _summarize(parts, duration: float) -> dict:
+    latencies = {}
+    errors = {}
+    for part in parts:
+        for route, values in part["latencies"].items():
+            latencies.setdefault(route, []).extend(values)
+        for route, n in part["errors"].items():
+            errors[route] = errors.get(route, 0) + n
+
+    routes = {
+        route: _stats(values, errors.get(route, 0), duration)
+        for route, values in sorted(latencies.items())
+    }
+    everything = [v for values in latencies.values() for v in values]
+    return {
+        "routes": routes,
+        "total": _stats(everything, sum(errors.values()), duration),
+        "missed": sum(part["missed"] for part in parts),
+    }
+
+
+def _print_step(mode: str, level, result: dict):
+    unit = "clients" if mode == "closed" else "req/s offered"
+    print(f"\n{mode} loop, {level} {unit}" + (f"  ({result['missed']} arrivals missed)" if result["missed"] else ""))
+    print(f"{'route':22s} {'reqs':>7s} {'err':>5s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for route, s in list(result["routes"].items()) + [("ALL", result["total"])]:
+        print(
+            f"{route:22s} {s['requests']:7d} {s['errors']:5d} {s['throughput']:8.1f} "
+            f"{s['p50_ms']:8.2f} {s['p95_ms']:8.2f} {s['p99_ms']:8.2f}"
+        )
+
+
+# ----------------------------------------
+# Local server
+# ----------------------------------------
+
+def _host_port(url: str):
+    parts = urlsplit(url)
+    return parts.hostname, parts.port or 80
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind: str, workers: int = None, worker_class: str = None, threads: int = None, env: dict = None):
+    """
+    (url, Popen) for app:app on a free local port. Worker settings left
+    as None come from gunicorn.conf.py; env is added to the server's
+    environment.
+    """
+    port = _free_port()
+    if kind == "gunicorn":
+        cmd = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "--log-level", "warning"]
+        for flag, value in (("--workers", workers), ("--worker-class", worker_class), ("--threads", threads)):
+            if value is not None:
+                cmd += [flag, str(value)]
+        cmd.append("app:app")
+    else:
+        cmd = [
+            sys.executable, "-c",
+            "import logging; logging.getLogger('werkzeug').setLevel(logging.WARNING); "
+            "from werkzeug.serving import make_server; from app import app; "
+            f"make_server('127.0.0.1', {port}, app, threaded=True).serve_forever()",
+        ]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env={**os.environ, **(env or {})})
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            if conn.getresponse().status == 200:
+                return url, proc
+        except OSError:
+            time.sleep(0.1)
+    stop_server(proc)
+    raise RuntimeError("server did not become ready within 30s")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# ----------------------------------------
+# CLI
+# ----------------------------------------
+
+def _parse_mix(value: str):
+    mix = []
+    for item in value.split(","):
+        route, _, weight = item.partition("=")
+        route = route.strip()
+        if route not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown route {route!r} (choose from {', '.join(ROUTES)})")
+        mix.append((route, float(weight or 1)))
+    return mix
+
+
+def _parse_levels(value: str):
+    return [float(v) if "." in v else int(v) for v in value.split(",")]
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    target = parser.add_argument_group("target")
+    target.add_argument("--url", help="load an already running server instead of starting one")
+    target.add_argument("--server", choices=("gunicorn", "threaded"), default="gunicorn")
+    target.add_argument("--workers", type=int, help="default: from gunicorn.conf.py")
+    target.add_argument("--worker-class", help="default: from gunicorn.conf.py")
+    target.add_argument("--threads", type=int, help="default: from gunicorn.conf.py")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--mode", choices=("closed", "open"), default="closed")
+    load.add_argument("--concurrency", type=_parse_levels, default=[1, 2, 4, 8, 16, 32],
+                      help="closed loop: comma-separated client counts")
+    load.add_argument("--rate", type=_parse_levels, default=[100, 200, 400, 800],
+                      help="open loop: comma-separated offered req/s")
+    load.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX),
+                      help=f"route=weight,... (default {DEFAULT_MIX})")
+    load.add_argument("--duration", type=float, default=10.0, help="measured seconds per step")
+    load.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds per step")
+    load.add_argument("--procs", type=int, default=min(4, os.cpu_count() or 1), help="generator processes")
+    load.add_argument("--max-inflight", type=int, default=256, help="open loop: max concurrent requests")
+    parser.add_argument("--output", "-o", help="write results JSON here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    levels = args.concurrency if args.mode == "closed" else args.rate
+
+    proc = None
+    url = args.url
+    if url is None:
+        url, proc = start_server(args.server, args.workers, args.worker_class, args.threads)
+
+    config = {
+        "url": url,
+        "server": None if args.url else args.server,
+        "workers": args.workers,
+        "worker_class": args.worker_class,
+        "threads": args.threads,
+        "mode": args.mode,
+        "mix": dict(args.mix),
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "procs": args.procs,
+    }
+    steps = []
+    try:
+        for level in levels:
+            result = run_step(url, args.mix, args.mode, level, args.duration, args.warmup,
+                              args.procs, args.max_inflight)
+            _print_step(args.mode, level, result)
+            steps.append({"level": level, **result})
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "config": config, "steps": steps}, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# benchmarks/parse_bench.py
+# Microbenchmark: datetime_parser.parse_datetime_flex vs the strptime loop
+# it replaced. Also re-checks that both agree on a fuzzed input set.
+#
+#   python -m benchmarks.parse_bench
+
+import random
+import timeit
+from datetime import datetime
+
+import datetime_parser
+from datetime_parser import parse_datetime_flex, clear_parse_cache
+
+
+def parse_datetime_strptime(dob_str, tob_str=None):
+    """The original app._parse_datetime_flex (reference implementation)."""
+    if not dob_str:
+        return None
+
+    dt = None
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            dt = datetime.strptime(dob_str, fmt)
+            break
+        except ValueError:
+            continue
+
+    if dt is None:
+        return None
+
+    if tob_str:
+        try:
+            t = datetime.strptime(tob_str, "%H:%M")
+            dt = dt.replace(hour=t.hour, minute=t.minute)
+        except ValueError:
+            pass
+
+    return dt
+
+
+def _realistic_inputs(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        y, m, d = rng.randrange(1940, 2015), rng.randrange(1, 13), rng.randrange(1, 29)
+        dob = f"{d:02d}/{m:02d}/{y}" if rng.random() < 0.5 else f"{y}-{m:02d}-{d:02d}"
+        tob = f"{rng.randrange(24):02d}:{rng.randrange(60):02d}" if rng.random() < 0.8 else None
+        out.append((dob, tob))
+    return out
+
+
+def _fuzz_inputs(n: int, seed: int = 2):
+    rng = random.Random(seed)
+    alphabet = "0123456789/-: a٣٩"
+    pieces = ["31", "30", "29", "02", "2", "12", "13", "00", "0", " 5", "2000", "1999", "0000", "١٩٩٩"]
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.5:
+            dob = "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 12)))
+        else:
+            sep = rng.choice("/-")
+            dob = sep.join(rng.choice(pieces) for _ in range(rng.choice((2, 3, 3, 3, 4))))
+        tob = rng.choice([None, "", "23:59", "24:00", "7:5", "07:60", "1:2:3", " 7:05", "١:٣٣", "12:5a"])
+        out.append((dob, tob))
+    return out
+
+
+def check_equivalence():
+    for dob, tob in _realistic_inputs(20000) + _fuzz_inputs(200000):
+        expected = parse_datetime_strptime(dob, tob)
+        got = parse_datetime_flex(dob, tob)
+        if expected != got:
+            raise AssertionError(f"{dob!r} {tob!r}: strptime={expected!r} fast={got!r}")
+
+
+def main():
+    check_equivalence()
+
+    inputs = _realistic_inputs(10000)
+    number = 5
+
+    def run(fn):
+        return min(timeit.repeat(lambda: [fn(d, t) for d, t in inputs], number=number, repeat=3))
+
+    baseline = run(parse_datetime_strptime)
+
+    # No memo: call the undecorated field parsers directly
+    parse_date = datetime_parser._parse_date.__wrapped__
+    parse_time = datetime_parser._parse_time.__wrapped__
+
+    def uncached(dob, tob):
+        dt = parse_date(dob)
+        if dt is not None and tob:
+            t = parse_time(tob)
+            if t is not None:
+                dt = dt.replace(hour=t[0], minute=t[1])
+        return dt
+
+    cold = run(uncached)
+    clear_parse_cache()
+    warm = run(parse_datetime_flex)
+
+    per_call = 1e6 / (len(inputs) * number)
+    print(f"strptime loop     : {baseline * per_call:6.2f} us/call")
+    print(f"fast parser       : {cold * per_call:6.2f} us/call  ({baseline / cold:4.1f}x)")
+    print(f"fast parser + memo: {warm * per_call:6.2f} us/call  ({baseline / warm:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
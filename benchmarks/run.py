@@ -0,0 +1,78 @@
+# benchmarks/run.py
+# Run the engine microbenchmarks and endpoint throughput benchmarks,
+# write results as JSON, and optionally fail on regressions against a
+# saved baseline.
+#
+#   python -m benchmarks.run --output bench.json
+#   python -m benchmarks.run --compare bench.json --threshold 0.10
+#   python -m benchmarks.run --only engine. --quick
+
+import argparse
+import json
+import sys
+
+import benchmarks.engines  # noqa: F401  (registers benchmarks)
+import benchmarks.endpoints  # noqa: F401
+from benchmarks.harness import BENCHMARKS, compare, metadata, run
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--output", "-o", help="write results JSON here")
+    parser.add_argument("--compare", "-c", metavar="BASELINE", help="results JSON to compare against")
+    parser.add_argument("--threshold", "-t", type=float, default=0.10,
+                        help="allowed slowdown vs baseline before failing (default 0.10 = 10%%)")
+    parser.add_argument("--only", action="append", default=[],
+                        help="run benchmarks whose name starts with this prefix (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="shorter runs (noisier)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+
+    names = [
+        name for name in BENCHMARKS
+        if not args.only or any(name.startswith(prefix) for prefix in args.only)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = run(
+        names,
+        repeat=3 if args.quick else args.repeat,
+        min_time=0.05 if args.quick else 0.2,
+        log=lambda line: print(line, file=sys.stderr),
+    )
+    report = {"meta": metadata(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if not args.compare:
+        if not args.output:
+            json.dump(report, sys.stdout, indent=2, sort_keys=True)
+            print()
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)["results"]
+
+    rows, regressions = compare(baseline, results, args.threshold)
+    print(f"{'benchmark':48s} {'baseline':>10s} {'current':>10s} {'change':>8s}")
+    for name, before, after, ratio in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:48s} {before:10.2f} {after:10.2f} {ratio - 1:+8.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# benchmarks/worker_memory.py
+# Resident memory per gunicorn worker with and without preloading
+# (gunicorn.conf.py, BAZI_PRELOAD): boots each configuration, reads
+# /proc/<pid>/smaps_rollup of the master and every worker once idle and
+# again after a round of mixed traffic. Linux only.
+#
+#   RSS  resident pages, shared ones counted in full
+#   PSS  shared pages divided between the processes mapping them
+#   USS  pages private to the process (the cost of one more worker)
+#
+#   python -m benchmarks.worker_memory --workers 4 --requests 4000
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import time
+
+from benchmarks.loadtest import DEFAULT_MIX, RequestPlan, _host_port, _parse_mix, _send, start_server, stop_server
+
+CONFIGS = (("no preload", {"BAZI_PRELOAD": "0"}), ("preload", {"BAZI_PRELOAD": "1"}))
+
+
+def memory_kb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            parts = rest.split()
+            if len(parts) == 2 and parts[1] == "kB":
+                fields[name] = int(parts[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def worker_pids(master: int):
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # ppid is the 2nd field after the parenthesised command name
+        if int(stat.rsplit(")", 1)[1].split()[1]) == master:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def snapshot(master: int) -> dict:
+    workers = [memory_kb(pid) for pid in worker_pids(master)]
+    master_mem = memory_kb(master)
+    n = len(workers) or 1
+    return {
+        "workers": len(workers),
+        "master": master_mem,
+        "worker_avg": {key: sum(w[key] for w in workers) / n for key in ("rss", "pss", "uss")},
+        "total_pss": master_mem["pss"] + sum(w["pss"] for w in workers),
+    }
+
+
+def _wait_for_workers(master: int, count: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while len(worker_pids(master)) < count and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+def _drive(url: str, mix, requests: int):
+    host, port = _host_port(url)
+    plan = RequestPlan(mix, seed=1)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    for _ in range(requests):
+        _send(conn, plan.next()[1])
+    conn.close()
+
+
+def measure(label: str, env: dict, workers: int, requests: int, mix, settle: float) -> dict:
+    url, proc = start_server("gunicorn", workers=workers, env=env)
+    try:
+        _wait_for_workers(proc.pid, workers)
+        time.sleep(settle)
+        idle = snapshot(proc.pid)
+        _drive(url, mix, requests)
+        time.sleep(settle)
+        loaded = snapshot(proc.pid)
+    finally:
+        stop_server(proc)
+    return {"config": label, "idle": idle, "loaded": loaded}
+
+
+def _print(results):
+    print(f"{'config':12s} {'phase':7s} {'workers':>7s} {'RSS/w MiB':>10s} {'PSS/w MiB':>10s} "
+          f"{'USS/w MiB':>10s} {'total PSS MiB':>14s}")
+    for result in results:
+        for phase in ("idle", "loaded"):
+            s = result[phase]
+            avg = s["worker_avg"]
+            print(
+                f"{result['config']:12s} {phase:7s} {s['workers']:7d} {avg['rss'] / 1024:10.1f} "
+                f"{avg['pss'] / 1024:10.1f} {avg['uss'] / 1024:10.1f} {s['total_pss'] / 1024:14.1f}"
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.worker_memory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=4000, help="mixed requests sent before the second reading")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX))
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to wait before each reading")
+    parser.add_argument("--output", "-o", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    results = [
+        measure(label, env, args.workers, args.requests, args.mix, args.settle)
+        for label, env in CONFIGS
+    ]
+    _print(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
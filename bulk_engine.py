@@ -0,0 +1,87 @@
+# bulk_engine.py
+# Purpose: chart / reading results for large NDJSON uploads (/bulk).
+#
+# Records are read lazily, charted a chunk at a time with compute_bazi_batch
+# and yielded one result per input line, so memory stays flat however
+# large the upload is. Bad lines produce an error result, never an abort.
+
+import json
+from itertools import islice
+
+from bazi_batch import compute_bazi_batch
+from da_yun_engine import parse_gender
+from profile_engine import ProfileContext, build_profile
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _parse_record(line_no: int, raw, parse_datetime):
+    """(result stub, birth datetime or None, gender) for one NDJSON line."""
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        return {"line": line_no, "error": "Invalid JSON"}, None, None
+
+    if not isinstance(record, dict):
+        return {"line": line_no, "error": "Each line must be a JSON object"}, None, None
+
+    dob_str = record.get("date_of_birth") or record.get("birth_date")
+    tob_str = record.get("time_of_birth") or record.get("birth_time")
+
+    result = {"line": line_no}
+    if "id" in record:
+        result["id"] = record["id"]
+    result["input"] = {"date_of_birth": dob_str, "time_of_birth": tob_str}
+    if "gender" in record:
+        result["input"]["gender"] = record["gender"]
+
+    if not dob_str:
+        result["error"] = "date_of_birth is required"
+        return result, None, None
+
+    try:
+        gender = parse_gender(record.get("gender"))
+    except ValueError as e:
+        result["error"] = str(e)
+        return result, None, None
+
+    try:
+        dt = parse_datetime(dob_str, tob_str)
+    except TypeError:
+        dt = None
+    if dt is None:
+        result["error"] = "Invalid date/time"
+        return result, None, None
+
+    return result, dt, gender
+
+
+def _process_chunk(parsed, sections, as_of):
+    valid = [dt for _, dt, _ in parsed if dt is not None]
+    charts = iter(compute_bazi_batch(valid).to_charts()) if valid else iter(())
+
+    for result, dt, gender in parsed:
+        if dt is not None:
+            ctx = ProfileContext(dt, as_of=as_of, chart=next(charts), gender=gender)
+            result["profile"] = build_profile(ctx, sections)
+        yield result
+
+
+def iter_bulk_results(lines, parse_datetime, sections, as_of, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    lines: iterable of NDJSON lines (str or bytes)
+    parse_datetime: (dob_str, tob_str) -> datetime | None
+    Yields one result dict per non-blank line, in input order.
+    """
+    numbered = (
+        (line_no, raw)
+        for line_no, raw in enumerate(lines, start=1)
+        if raw.strip()
+    )
+
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        parsed = [_parse_record(line_no, raw, parse_datetime) for line_no, raw in chunk]
+        yield from _process_chunk(parsed, sections, as_of)
@@ -1,7 +1,12 @@
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
 
-from merit_engine import STEM_ELEMENT, BRANCH_ELEMENT
-from bazi_core import compute_year_pillar_basic
+from merit_engine import ELEMENTS, STEM_ELEMENT, BRANCH_ELEMENT
+from bazi_core import PILLARS, compute_year_pillar_basic, solar_term_start
+from da_yun_engine import get_da_yun
+from json_fragments import EncodedDict
+from stage_timing import timed
 
 
 DAY_MASTER_PERSONALITY = {
@@ -269,113 +274,95 @@ ELEMENT_CONTROLS = {
 }
 
 
+# -------------------------------------------------------------
+# Element relation matrix
+#
+# RELATION_MATRIX[day master][other] → index into RELATIONS, shared by
+# the decade relation (_get_element_relation) and the year relation,
+# which uses its own labels for the same five cases.
+# -------------------------------------------------------------
+RELATIONS = ("same", "resource", "output", "control", "pressure", "unknown")
+
+ELEMENT_INDEX = {element: i for i, element in enumerate(ELEMENTS)}
+
+YEAR_RELATION_BY_ELEMENT_RELATION = {
+    "same": "same",
+    "resource": "produces",
+    "control": "drains",
+    "pressure": "controls",
+    "output": "controlled_by",
+    "unknown": "controlled_by",
+}
+
+
 def _pick_variant(options: list, seed_text: str) -> str:
     index = sum(ord(c) for c in seed_text) % len(options)
     return options[index]
 
 
-def _get_age(birth_dt: datetime) -> int:
-    now = datetime.now()
-    age = now.year - birth_dt.year
-    before_birthday = (now.month, now.day) < (birth_dt.month, birth_dt.day)
-    if before_birthday:
-        age -= 1
-    return age
+# Injectable clock: used only when no as_of is given
+clock = datetime.now
 
 
-def _relation_of_year_to_day_master(dm_element: str, year_element: str) -> str:
-    if dm_element == year_element:
-        return "same"
+@dataclass(frozen=True)
+class PhaseContext:
+    """Everything time-dependent in a reading, derived once per request."""
+    as_of: datetime
+    luck_pillar: int     # sexagenary index of the Da Yun pillar in effect
+    year: int
+    year_element: str
 
-    produces_map = {
-        "Wood": "Water",
-        "Fire": "Wood",
-        "Earth": "Fire",
-        "Metal": "Earth",
-        "Water": "Metal",
-    }
-    if produces_map.get(dm_element) == year_element:
-        return "produces"
-
-    controls_map = {
-        "Wood": "Earth",
-        "Fire": "Metal",
-        "Earth": "Water",
-        "Metal": "Wood",
-        "Water": "Fire",
-    }
-    if controls_map.get(dm_element) == year_element:
-        return "drains"
-
-    controlled_by_map = {
-        "Wood": "Metal",
-        "Fire": "Water",
-        "Earth": "Wood",
-        "Metal": "Fire",
-        "Water": "Earth",
-    }
-    if controlled_by_map.get(dm_element) == year_element:
-        return "controls"
 
-    return "controlled_by"
+def build_phase_context(birth_dt: datetime, as_of: datetime = None, gender: str = "male") -> PhaseContext:
+    if as_of is None:
+        as_of = clock()
+    year = _current_year_info(as_of)
+    return PhaseContext(
+        as_of=as_of,
+        luck_pillar=get_da_yun(birth_dt, gender).pillar_at(as_of.date()),
+        year=year["year"],
+        year_element=year["element"],
+    )
 
 
-def _current_year_info():
-    now = datetime.now()
-    yp = compute_year_pillar_basic(now)
+def _relation_of_year_to_day_master(dm_element: str, year_element: str) -> str:
+    return YEAR_RELATION_BY_ELEMENT_RELATION[_get_element_relation(dm_element, year_element)]
+
+
+# -------------------------------------------------------------
+# Year context, cached per calendar day
+#
+# The year part of a reading only changes when the date
+# rolls over or at Li Chun, so it is computed once per day (split at
+# the Li Chun minute on Li Chun day).
+# -------------------------------------------------------------
+def _year_info_at(as_of: datetime):
+    yp = compute_year_pillar_basic(as_of)
     return {
         "element": STEM_ELEMENT.get(yp.stem, "Unknown"),
-        "year": now.year,
+        "year": as_of.year,
     }
 
 
-def _get_month_stem_branch(chart):
-    if hasattr(chart, "month") and hasattr(chart.month, "stem") and hasattr(chart.month, "branch"):
-        return chart.month.stem, chart.month.branch
-
-    if hasattr(chart, "month_pillar"):
-        month_pillar = chart.month_pillar
-
-        if isinstance(month_pillar, dict):
-            return month_pillar.get("stem"), month_pillar.get("branch")
-
-        if hasattr(month_pillar, "stem") and hasattr(month_pillar, "branch"):
-            return month_pillar.stem, month_pillar.branch
-
-    return None, None
-
-
-def _get_da_yun_period_index(birth_dt: datetime) -> int:
-    age = _get_age(birth_dt)
-    return 0 if age < 10 else age // 10
-
-
-def _shift_stem(stem: str, steps: int) -> str:
-    if stem not in STEMS:
-        return stem
-    return STEMS[(STEMS.index(stem) + steps) % 10]
-
-
-def _shift_branch(branch: str, steps: int) -> str:
-    if branch not in BRANCHES:
-        return branch
-    return BRANCHES[(BRANCHES.index(branch) + steps) % 12]
-
-
-def _get_light_da_yun_pillar(chart, birth_dt: datetime):
-    month_stem, month_branch = _get_month_stem_branch(chart)
-    idx = _get_da_yun_period_index(birth_dt)
+@lru_cache(maxsize=1024)
+def _year_info_for_day(ordinal: int):
+    """(info at 00:00, Li Chun start or None, info after Li Chun)."""
+    day_start = datetime.fromordinal(ordinal)
+    first = _year_info_at(day_start)
+    last = _year_info_at(day_start + timedelta(hours=23, minutes=59))
+    if first == last:
+        return first, None, first
+    return first, solar_term_start(24 * day_start.year), last
 
-    if not month_stem or not month_branch:
-        return {"stem": None, "branch": None}
 
-    return {
-        "stem": _shift_stem(month_stem, idx),
-        "branch": _shift_branch(month_branch, idx),
-    }
+def _current_year_info(as_of: datetime):
+    before, li_chun, after = _year_info_for_day(as_of.toordinal())
+    if li_chun is not None and as_of >= li_chun:
+        return after
+    return before
 
 
-def _get_element_relation(dm, other):
+def _classify_element_relation(dm, other):
     if dm == other:
         return "same"
     if ELEMENT_GENERATES.get(other) == dm:
@@ -389,13 +376,22 @@ def _get_element_relation(dm, other):
     return "unknown"
 
 
-def _get_current_decade_text(chart, birth_dt, dm_element):
-    da = _get_light_da_yun_pillar(chart, birth_dt)
-    if not da.get("stem"):
-        return DECADE_RELATION_TEXT["unknown"]
+def _get_element_relation(dm, other):
+    i = ELEMENT_INDEX.get(dm)
+    j = ELEMENT_INDEX.get(other)
+    if i is None or j is None:
+        return _classify_element_relation(dm, other)
+    return RELATIONS[RELATION_MATRIX[i][j]]
+
+
+RELATION_MATRIX = tuple(
+    tuple(RELATIONS.index(_classify_element_relation(dm, other)) for other in ELEMENTS)
+    for dm in ELEMENTS
+)
 
-    rel = _get_element_relation(dm_element, STEM_ELEMENT.get(da["stem"], "Unknown"))
-    return DECADE_RELATION_TEXT.get(rel, DECADE_RELATION_TEXT["unknown"])
+
+def _get_current_decade_text(decade_relation):
+    return DECADE_RELATION_TEXT.get(decade_relation, DECADE_RELATION_TEXT["unknown"])
 
 
 def _build_current_phase_summary(p, ph, u):
@@ -431,10 +427,101 @@ def _build_presentation(dm, db, element, underlying, year_relation, decade_relat
     }
 
 
-def generate_current_phase_reading(chart, birth_dt: datetime):
+def generate_current_phase_reading(chart, birth_dt: datetime, as_of: datetime = None, gender: str = "male"):
+    """
+    Reading for chart as of `as_of` (default: clock()). The luck pillar
+    and year element are derived once, so the result is a pure function
+    of (chart, birth_dt, as_of, gender).
+    (shared pre-rendered dict — treat it as read-only)
+    """
+    return get_rendered_reading(chart, birth_dt, as_of, gender).data
+
+
+# -------------------------------------------------------------
+# Pre-rendered readings
+#
+# Once the decade relation and the year are known, a reading depends
+# only on the day pillar, so readings are built and JSON-encoded (same
+# settings as Flask's jsonify) once per combination and shared.
+# -------------------------------------------------------------
+READING_CACHE_SIZE = 4096
+
+
+class RenderedReading:
+    __slots__ = ("data", "json")
+
+    def __init__(self, data: dict):
+        self.data = EncodedDict(data)
+        self.json = self.data.json.encode("ascii")
+
+
+@timed("reading")
+def get_rendered_reading(chart, birth_dt: datetime, as_of: datetime = None, gender: str = "male") -> RenderedReading:
+    """
+    Pre-rendered reading (see generate_current_phase_reading).
+    .data is shared between requests — treat it as read-only.
+    """
+    return _rendered_reading(*reading_key(chart, birth_dt, as_of, gender))
+
+
+@timed("reading")
+def get_rendered_reading_for_key(key: tuple) -> RenderedReading:
+    """Pre-rendered reading for a reading_key() the caller already has."""
+    return _rendered_reading(*key)
+
+
+@timed("reading")
+def reading_key(chart, birth_dt: datetime, as_of: datetime = None, gender: str = "male") -> tuple:
+    """
+    (day master, day branch, year, year element, decade relation):
+    everything a reading depends on. Equal keys → identical readings.
+    """
+    ctx = build_phase_context(birth_dt, as_of, gender)
+
     dm = chart.day_master
     db = chart.day.branch
 
+    element = STEM_ELEMENT.get(dm, "Unknown")
+    decade_relation = _get_element_relation(element, PILLARS[ctx.luck_pillar].stem_element)
+
+    return dm, db, ctx.year, ctx.year_element, decade_relation
+
+
+def reading_expires(as_of: datetime) -> datetime:
+    """
+    Earliest time after as_of at which a reading can change: the next
+    midnight (luck pillars start at midnight), or Li Chun if it falls
+    later the same day.
+    """
+    _, li_chun, _ = _year_info_for_day(as_of.toordinal())
+    if li_chun is not None and as_of < li_chun:
+        return li_chun
+    return datetime.fromordinal(as_of.toordinal() + 1)
+
+
+@lru_cache(maxsize=READING_CACHE_SIZE)
+def _rendered_reading(dm, db, year, year_element, decade_relation) -> RenderedReading:
+    return RenderedReading(_build_reading(dm, db, year, year_element, decade_relation))
+
+
+def warm_reading_cache(as_of: datetime = None) -> int:
+    """
+    Render every reading for the year in effect at as_of (each day
+    pillar × decade relation), so a pre-forking server builds them once
+    before fork. Returns the number of readings.
+    """
+    if as_of is None:
+        as_of = clock()
+    year = _current_year_info(as_of)
+    count = 0
+    for i in range(60):
+        for decade_relation in RELATIONS:
+            _rendered_reading(STEMS[i % 10], BRANCHES[i % 12], year["year"], year["element"], decade_relation)
+            count += 1
+    return count
+
+
+def _build_reading(dm, db, year, year_element, decade_relation):
     element = STEM_ELEMENT.get(dm, "Unknown")
     underlying = BRANCH_ELEMENT.get(db, "Unknown")
 
@@ -443,23 +530,16 @@ def generate_current_phase_reading(chart, birth_dt: datetime):
     phase = _pick_variant(CURRENT_PHASE_TEXT[element], seed) if element in CURRENT_PHASE_TEXT else None
     underlying_text = _pick_variant(UNDERLYING_RHYTHM_TEXT[underlying], seed) if underlying in UNDERLYING_RHYTHM_TEXT else None
 
-    year = _current_year_info()
-    rel = _relation_of_year_to_day_master(element, year["element"])
+    rel = _relation_of_year_to_day_master(element, year_element)
 
-    decade = _get_current_decade_text(chart, birth_dt, element)
-
-    da = _get_light_da_yun_pillar(chart, birth_dt)
-    decade_relation = (
-        _get_element_relation(element, STEM_ELEMENT.get(da["stem"], "Unknown"))
-        if da.get("stem") else "unknown"
-    )
+    decade = _get_current_decade_text(decade_relation)
 
     signals = {
         "day_master": dm,
         "day_master_element": element,
         "day_branch": db,
         "day_branch_element": underlying,
-        "year_element": year["element"],
+        "year_element": year_element,
         "year_relation": rel,
         "decade_relation": decade_relation,
     }
@@ -477,7 +557,7 @@ def generate_current_phase_reading(chart, birth_dt: datetime):
         },
         "this_year": {
             "title": "What This Year Is Bringing",
-            "year": year["year"],
+            "year": year,
             "summary": YEAR_FEELING.get(rel, "This year is bringing a meaningful shift in pace and priorities."),
             "details": YEAR_DETAILS.get(rel, "This year carries an influence worth paying attention to — how you respond to it matters more than the circumstances themselves."),
             "opportunity": YEAR_OPPORTUNITY.get(rel, "There is still useful momentum here if you respond with awareness."),
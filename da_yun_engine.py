@@ -0,0 +1,238 @@
+# da_yun_engine.py
+# Purpose: Da Yun (大运, luck pillar) timeline for a birth datetime and gender.
+#
+# Luck pillars step through the 60-pillar cycle from the month pillar:
+# forward for a yang year stem and male, or a yin year stem and female;
+# backward otherwise. The first one begins after the distance from
+# birth to the next 節 (forward) or from the previous 節 (backward),
+# counted at 3 days = 1 year (1 day = 4 months, 2 hours = 10 days).
+# Each pillar then lasts ten years.
+
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import MAXYEAR, date, datetime, timedelta
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+
+from bazi_core import PILLARS, compute_placeholder_bazi, solar_term_number, solar_term_start
+from stage_timing import timed
+
+DECADE_COUNT = 10
+DA_YUN_CACHE_SIZE = int(os.environ.get("BAZI_DA_YUN_CACHE_SIZE", "16384"))
+
+_GENDER_ALIASES = {"male": "male", "m": "male", "female": "female", "f": "female"}
+
+# Minutes of birth-to-節 distance per year / month / day of life
+_MINUTES_PER_YEAR = 3 * 1440
+_MINUTES_PER_MONTH = 1440 // 4
+_MINUTES_PER_DAY = 120 // 10
+
+_ONE_DAY = timedelta(days=1)
+
+# Outside the solar term table (1900–2100): half a month's distance
+_FALLBACK_OFFSET = (5, 0, 0)
+
+
+def parse_gender(value) -> str:
+    """None / "" → "male"; raises ValueError on anything else unrecognised."""
+    if not value:
+        return "male"
+    gender = _GENDER_ALIASES.get(str(value).strip().lower())
+    if gender is None:
+        raise ValueError("gender must be 'male' or 'female'")
+    return gender
+
+
+def _add_years_months(d: date, years: int, months: int = 0) -> date:
+    """d plus years and months; date.max past the end of the calendar."""
+    month0 = d.month - 1 + months
+    year = d.year + years + month0 // 12
+    month = month0 % 12 + 1
+    if year > MAXYEAR:
+        return date.max
+    try:
+        return d.replace(year=year, month=month)
+    except ValueError:
+        # 29–31 → last day of a shorter month
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        return next_month - timedelta(days=1)
+
+
+def _day_before(d: date) -> date:
+    """Last day of a decade ending at d (date.max stays: open-ended)."""
+    return d - _ONE_DAY if d < date.max else d
+
+
+def _full_years(start: date, end: date) -> int:
+    return end.year - start.year - ((end.month, end.day) < (start.month, start.day))
+
+
+def _start_offset(birth_dt: datetime, forward: bool):
+    """(years, months, days) from birth to the first luck pillar."""
+    number = solar_term_number(birth_dt)
+    if number is None:
+        return _FALLBACK_OFFSET
+    jie = number - number % 2
+    boundary = solar_term_start(jie + 2 if forward else jie)
+    if boundary is None:
+        return _FALLBACK_OFFSET
+    minutes = int(abs((boundary - birth_dt).total_seconds()) // 60)
+    years, rest = divmod(minutes, _MINUTES_PER_YEAR)
+    months, rest = divmod(rest, _MINUTES_PER_MONTH)
+    return years, months, rest // _MINUTES_PER_DAY
+
+
+# ----------------------------------------
+# Timeline
+# ----------------------------------------
+
+@dataclass(frozen=True)
+class DaYun:
+    forward: bool
+    offset: tuple        # (years, months, days) from birth to the first luck pillar
+    month_pillar: int    # sexagenary index; in effect until the first luck pillar
+    starts: tuple        # date each luck pillar begins, plus the end of the last one
+
+    def pillar(self, decade: int) -> int:
+        """Sexagenary index of luck pillar `decade` (1-based; 0 = month pillar)."""
+        return (self.month_pillar + (decade if self.forward else -decade)) % 60
+
+    def decade_at(self, when: date) -> int:
+        """Number of the luck pillar in effect on `when` (0 before the first)."""
+        decade = bisect_right(self.starts, when)
+        if decade == len(self.starts):
+            decade += _full_years(self.starts[-1], when) // 10
+        return decade
+
+    def pillar_at(self, when: date) -> int:
+        return self.pillar(self.decade_at(when))
+
+
+@lru_cache(maxsize=DA_YUN_CACHE_SIZE)
+def _da_yun(birth_dt: datetime, gender: str) -> DaYun:
+    chart = compute_placeholder_bazi(birth_dt)
+    yang_year = chart.year.index % 2 == 0
+    forward = yang_year == (gender == "male")
+
+    offset = _start_offset(birth_dt, forward)
+    years, months, days = offset
+    first = _add_years_months(birth_dt.date(), years, months)
+    # Births in the last years of the calendar: later decades start at date.max
+    first = first + timedelta(days=days) if first < date.max - timedelta(days=days) else date.max
+    return DaYun(
+        forward=forward,
+        offset=offset,
+        month_pillar=chart.month.index,
+        starts=tuple(_add_years_months(first, 10 * i) for i in range(DECADE_COUNT + 1)),
+    )
+
+
+@timed("da_yun")
+def get_da_yun(birth_dt: datetime, gender: str = "male") -> DaYun:
+    """Luck pillar timeline, memoized per (birth datetime, gender)."""
+    return _da_yun(birth_dt, gender)
+
+
+def clear_da_yun_cache():
+    _da_yun.cache_clear()
+    _rendered_da_yun.cache_clear()
+
+
+# ----------------------------------------
+# Pre-rendered timeline (/bazi_decades)
+#
+# Only the dates and ages of a decade differ between charts; its pillar
+# fields are fixed per sexagenary index. So each decade's JSON is the
+# pillar's three pre-encoded pieces with the dynamic fields spliced in
+# between, in jsonify's sorted key order:
+#   branch, branch_element | decade, end, end_date | pillar | start,
+#   start_age, start_date | stem, stem_element
+# (same bytes as encode_compact(_build_timeline(...)), several times
+# faster).
+# ----------------------------------------
+
+def _decade_pieces(p) -> tuple:
+    e = encode_basestring_ascii
+    return (
+        f'{{"branch":{e(p.branch)},"branch_element":{e(p.branch_element)},',
+        f',"pillar":{e(str(p))},',
+        f',"stem":{e(p.stem)},"stem_element":{e(p.stem_element)}}}',
+    )
+
+
+_DECADE_PIECES = tuple(_decade_pieces(p) for p in PILLARS)
+
+
+def _encode_timeline(da_yun: DaYun) -> str:
+    years, months, days = da_yun.offset
+    starts = da_yun.starts
+    decades = []
+    for i in range(DECADE_COUNT):
+        head, middle, tail = _DECADE_PIECES[da_yun.pillar(i + 1)]
+        start = starts[i]
+        end = _day_before(starts[i + 1])
+        decades.append(
+            f'{head}"decade":{i + 1},"end":{end.year},"end_date":"{end.isoformat()}"'
+            f'{middle}"start":{start.year},"start_age":{years + 10 * i},"start_date":"{start.isoformat()}"{tail}'
+        )
+    return (
+        f'{{"decades":[{",".join(decades)}],'
+        f'"direction":"{"forward" if da_yun.forward else "backward"}",'
+        f'"month_pillar":{encode_basestring_ascii(str(PILLARS[da_yun.month_pillar]))},'
+        f'"start_date":"{starts[0].isoformat()}",'
+        f'"start_offset":{{"days":{days},"months":{months},"years":{years}}}}}'
+    )
+
+
+def _build_timeline(da_yun: DaYun) -> dict:
+    years, months, days = da_yun.offset
+    decades = []
+    for i in range(DECADE_COUNT):
+        p = PILLARS[da_yun.pillar(i + 1)]
+        start = da_yun.starts[i]
+        end = _day_before(da_yun.starts[i + 1])
+        decades.append({
+            "decade": i + 1,
+            "pillar": str(p),
+            "stem": p.stem,
+            "branch": p.branch,
+            "stem_element": p.stem_element,
+            "branch_element": p.branch_element,
+            "start_age": years + 10 * i,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "start": start.year,
+            "end": end.year,
+        })
+    return {
+        "direction": "forward" if da_yun.forward else "backward",
+        "start_offset": {"years": years, "months": months, "days": days},
+        "start_date": da_yun.starts[0].isoformat(),
+        "month_pillar": str(PILLARS[da_yun.month_pillar]),
+        "decades": decades,
+    }
+
+
+class RenderedDaYun:
+    __slots__ = ("da_yun", "json")
+
+    def __init__(self, da_yun: DaYun):
+        self.da_yun = da_yun
+        self.json = _encode_timeline(da_yun).encode("ascii")
+
+    @property
+    def data(self) -> dict:
+        """The timeline as a dict (built on each access)."""
+        return _build_timeline(self.da_yun)
+
+
+@lru_cache(maxsize=DA_YUN_CACHE_SIZE)
+def _rendered_da_yun(birth_dt: datetime, gender: str) -> RenderedDaYun:
+    return RenderedDaYun(_da_yun(birth_dt, gender))
+
+
+@timed("da_yun")
+def get_rendered_da_yun(birth_dt: datetime, gender: str = "male") -> RenderedDaYun:
+    """Timeline with its JSON encoding pre-rendered (.json, bytes)."""
+    return _rendered_da_yun(birth_dt, gender)
@@ -0,0 +1,219 @@
+# date_search_engine.py
+# Purpose: 择日 auspicious-date search: days (and two-hour windows) in a
+# date range whose pillars stand in given relations to a day master.
+#
+# Nothing is scanned day by day. Year and month pillars are constant over
+# a solar year / month, so inverted indexes map each pillar to the day
+# spans it covers: a query merges the spans of the allowed year pillars
+# and of the allowed month pillars and intersects the two lists. Day
+# pillars repeat every 60 days, so the matching days inside a span are a
+# few arithmetic progressions, and hour pillars depend only on the day
+# stem, so the matching hours are one list per day stem. Work grows with
+# the spans touched and the results taken, not with the window length.
+#
+# A day's year and month pillars are those in effect at noon (solar
+# terms change to the minute); its hour windows share them. Hour windows
+# are given as datetimes on that day: 子 appears as 00:00–01:00 and
+# 23:00–24:00, both with the day's own day pillar.
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from heapq import merge
+
+from bazi_core import EARTHLY_BRANCHES, HOUR_PILLAR_TABLE, PILLARS, SOLAR_TERMS, day_pillar_index
+from current_phase_engine import RELATIONS
+from flow_timeline_engine import flow_pillar_index, relation_row
+
+POSITIONS = ("year", "month", "day", "hour")
+MAX_SEARCH_RESULTS = 1000
+
+_NOON = 720
+
+# Windows of a calendar day in time order, as (hour slot, start hour,
+# end hour): 子 is split into its first and last hour, both of which
+# take that day's day pillar (the day does not roll over at 23:00)
+_DAY_WINDOWS = ((0, 0, 1), *((h, 2 * h - 1, 2 * h + 1) for h in range(1, 12)), (0, 23, 24))
+
+
+def _noon_day(minute: int) -> int:
+    """Ordinal of the first day whose noon is at or after `minute` (table minutes)."""
+    return SOLAR_TERMS.epoch_ordinal - ((_NOON - minute) // 1440)
+
+
+# ----------------------------------------
+# Solar month spans and inverted indexes
+# ----------------------------------------
+
+def _build_months():
+    first = SOLAR_TERMS.first_number + SOLAR_TERMS.first_number % 2   # first 節 in the table
+    last = SOLAR_TERMS.first_number + len(SOLAR_TERMS.minutes) - 1
+    numbers = range(first, last - 1, 2)                              # months whose end is known
+    starts = array("l", (_noon_day(SOLAR_TERMS.minutes[n - SOLAR_TERMS.first_number]) for n in numbers))
+    starts.append(_noon_day(SOLAR_TERMS.minutes[numbers[-1] + 2 - SOLAR_TERMS.first_number]))
+    years = bytes((n // 24 - 4) % 60 for n in numbers)
+    pillars = bytes(flow_pillar_index(n, 2) for n in numbers)
+    return numbers, starts, years, pillars
+
+
+# Every solar month in the table: opening term number, first day (plus
+# the day after the last month), year and month pillar
+_MONTH_NUMBERS, _MONTH_STARTS, _MONTH_YEARS, _MONTH_PILLARS = _build_months()
+
+SEARCH_START = date.fromordinal(_MONTH_STARTS[0])
+SEARCH_END = date.fromordinal(_MONTH_STARTS[-1])   # exclusive
+
+
+def _build_index(pillar_of) -> dict:
+    """Pillar index → (starts, ends) of the day spans it covers, in order."""
+    index = {p: (array("l"), array("l")) for p in range(60)}
+    for i in range(len(_MONTH_NUMBERS)):
+        starts, ends = index[pillar_of(i)]
+        if ends and ends[-1] == _MONTH_STARTS[i]:
+            ends[-1] = _MONTH_STARTS[i + 1]        # same pillar as the previous month: extend
+        else:
+            starts.append(_MONTH_STARTS[i])
+            ends.append(_MONTH_STARTS[i + 1])
+    return index
+
+
+YEAR_INDEX = _build_index(_MONTH_YEARS.__getitem__)
+MONTH_INDEX = _build_index(_MONTH_PILLARS.__getitem__)
+
+
+# ----------------------------------------
+# Filters
+# ----------------------------------------
+
+def parse_relations(value):
+    """
+    Relation filter for one pillar: "resource,same" (any of these),
+    "!pressure" (any but these) or a list of names. None / "" → None
+    (no filter); raises ValueError on other types and unknown names.
+    """
+    if value is None or (isinstance(value, (str, list, tuple)) and not value):
+        return None
+    exclude = False
+    if isinstance(value, str):
+        exclude = value.startswith("!")
+        value = value.lstrip("!").split(",")
+    elif not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise ValueError("Relation filters must be a comma-separated string or a list of relation names")
+    names = {v.strip() for v in value} - {""}
+    unknown = names.difference(RELATIONS)
+    if unknown:
+        raise ValueError(f"Unknown relation(s): {', '.join(sorted(unknown))}; expected: {', '.join(RELATIONS)}")
+    return frozenset(set(RELATIONS) - names if exclude else names)
+
+
+def _allowed(row: tuple, relations) -> tuple:
+    """Pillar indexes whose relation is in relations (every pillar for None)."""
+    if relations is None:
+        return tuple(range(60))
+    return tuple(p for p in range(60) if row[p] in relations)
+
+
+# ----------------------------------------
+# Query
+# ----------------------------------------
+
+def _spans(index: dict, pillars: tuple, lo: int, hi: int) -> list:
+    """Merged day spans [a, b) of the given pillars, clipped to [lo, hi)."""
+    runs = []
+    for p in pillars:
+        starts, ends = index[p]
+        i = bisect_right(ends, lo)
+        j = bisect_left(starts, hi)
+        runs.append(zip(starts[i:j], ends[i:j]))
+    return [(max(a, lo), min(b, hi)) for a, b in merge(*runs)]
+
+
+def _intersect(xs: list, ys: list) -> list:
+    out = []
+    i = j = 0
+    while i < len(xs) and j < len(ys):
+        a = max(xs[i][0], ys[j][0])
+        b = min(xs[i][1], ys[j][1])
+        if a < b:
+            out.append((a, b))
+        if xs[i][1] < ys[j][1]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def _days(spans: list, day_pillars: tuple):
+    """Ordinals of the days in spans whose day pillar is in day_pillars, in order."""
+    for a, b in spans:
+        first = day_pillar_index(date.fromordinal(a))
+        offsets = sorted((p - first) % 60 for p in day_pillars)
+        for base in range(a, b, 60):
+            for offset in offsets:
+                if base + offset >= b:
+                    break
+                yield base + offset
+
+
+def iter_date_matches(day_master: str, start: date, end: date, filters: dict):
+    """
+    Iterator over one dict per day in [start, end) (clipped to SEARCH_START..
+    SEARCH_END) whose year / month / day pillar relations to day_master
+    pass filters ({position: parse_relations(...)}), in date order: its
+    pillars and relations, and with an hour filter the matching hours.
+    Raises ValueError (before iterating) if day_master is not a stem.
+    """
+    return _iter_matches(relation_row(day_master), start, end, filters)
+
+
+def _iter_matches(row: tuple, start: date, end: date, filters: dict):
+    lo = max(start.toordinal(), _MONTH_STARTS[0])
+    hi = min(end.toordinal(), _MONTH_STARTS[-1])
+    if lo >= hi:
+        return
+
+    spans = [(lo, hi)]
+    if filters.get("year") is not None:
+        spans = _spans(YEAR_INDEX, _allowed(row, filters["year"]), lo, hi)
+    if filters.get("month") is not None:
+        spans = _intersect(spans, _spans(MONTH_INDEX, _allowed(row, filters["month"]), lo, hi))
+
+    # Day stem → hour slots whose pillar passes the hour filter
+    hour_filter = filters.get("hour")
+    hour_pillars = set(_allowed(row, hour_filter))
+    slots = tuple(
+        tuple(h for h in range(12) if HOUR_PILLAR_TABLE[stem * 12 + h] in hour_pillars)
+        for stem in range(10)
+    )
+    day_pillars = tuple(p for p in _allowed(row, filters.get("day")) if slots[p % 10])
+
+    for ordinal in _days(spans, day_pillars):
+        d = date.fromordinal(ordinal)
+        i = bisect_right(_MONTH_STARTS, ordinal) - 1
+        year = PILLARS[_MONTH_YEARS[i]]
+        month = PILLARS[_MONTH_PILLARS[i]]
+        day = PILLARS[day_pillar_index(d)]
+        match = {
+            "date": d.isoformat(),
+            "year": str(year),
+            "month": str(month),
+            "day": str(day),
+            "relations": {"year": row[year.index], "month": row[month.index], "day": row[day.index]},
+        }
+        if hour_filter is not None:
+            stem = day.index % 10
+            midnight = datetime.combine(d, time())
+            hours = []
+            for h, start_hour, end_hour in _DAY_WINDOWS:
+                if h not in slots[stem]:
+                    continue
+                hour = PILLARS[HOUR_PILLAR_TABLE[stem * 12 + h]]
+                hours.append({
+                    "branch": EARTHLY_BRANCHES[h],
+                    "pillar": str(hour),
+                    "relation": row[hour.index],
+                    "start": (midnight + timedelta(hours=start_hour)).isoformat(timespec="minutes"),
+                    "end": (midnight + timedelta(hours=end_hour)).isoformat(timespec="minutes"),
+                })
+            match["hours"] = hours
+        yield match
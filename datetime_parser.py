@@ -0,0 +1,139 @@
+# datetime_parser.py
+# Purpose: fast parser for the birth date / time strings every endpoint accepts.
+#
+# Hand-rolled equivalent of trying datetime.strptime with "%d/%m/%Y", then
+# "%Y-%m-%d", then "%H:%M" for the time: same accepted inputs (including
+# strptime's quirks: 1-digit fields, " 5" as a day, any Unicode decimal
+# digit where strptime uses \d), same results, same TypeError for
+# non-string input. strptime takes a lock and runs a regex per call;
+# this is plain string checks plus a memo per date and per time string.
+
+from datetime import datetime
+from functools import lru_cache
+
+# Memo sizes: real traffic has a few tens of thousands of distinct birth
+# dates and at most 1440 distinct times
+DATE_CACHE_SIZE = 32768
+TIME_CACHE_SIZE = 2048
+
+
+# ----------------------------------------
+# Field checks (mirror _strptime's regexes)
+# ----------------------------------------
+
+def _day(s: str):
+    # 3[0-1] | [1-2]\d | 0[1-9] | [1-9] | " [1-9]"
+    if len(s) == 1:
+        return int(s) if "1" <= s <= "9" else None
+    if len(s) == 2:
+        a, b = s
+        if (
+            (a == "3" and b in "01")
+            or (a in "12" and b.isdecimal())
+            or (a in "0 " and "1" <= b <= "9")
+        ):
+            return int(s)
+    return None
+
+
+def _month(s: str):
+    # 1[0-2] | 0[1-9] | [1-9]
+    if len(s) == 1:
+        return int(s) if "1" <= s <= "9" else None
+    if len(s) == 2:
+        a, b = s
+        if (a == "1" and b in "012") or (a == "0" and "1" <= b <= "9"):
+            return int(s)
+    return None
+
+
+def _year(s: str):
+    # \d\d\d\d
+    if len(s) == 4 and s.isdecimal():
+        return int(s)
+    return None
+
+
+def _hour(s: str):
+    # 2[0-3] | [0-1]\d | \d
+    if len(s) == 1:
+        return int(s) if s.isdecimal() else None
+    if len(s) == 2:
+        a, b = s
+        if (a == "2" and b in "0123") or (a in "01" and b.isdecimal()):
+            return int(s)
+    return None
+
+
+def _minute(s: str):
+    # [0-5]\d | \d
+    if len(s) == 1:
+        return int(s) if s.isdecimal() else None
+    if len(s) == 2:
+        a, b = s
+        if "0" <= a <= "5" and b.isdecimal():
+            return int(s)
+    return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(s: str):
+    for sep, order in (("/", (_day, _month, _year)), ("-", (_year, _month, _day))):
+        parts = s.split(sep)
+        if len(parts) != 3:
+            continue
+        values = [parse(part) for parse, part in zip(order, parts)]
+        if None in values:
+            continue
+        if sep == "/":
+            day, month, year = values
+        else:
+            year, month, day = values
+        try:
+            return datetime(year, month, day)
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def _parse_time(s: str):
+    parts = s.split(":")
+    if len(parts) != 2:
+        return None
+    hour, minute = _hour(parts[0]), _minute(parts[1])
+    if hour is None or minute is None:
+        return None
+    return hour, minute
+
+
+# ----------------------------------------
+# Public parser
+# ----------------------------------------
+
+def parse_datetime_flex(dob_str: str, tob_str: str | None = None):
+    """
+    "DD/MM/YYYY" or "YYYY-MM-DD", plus optional "HH:MM".
+    None for an empty or invalid date; an invalid time is ignored.
+    """
+    if not dob_str:
+        return None
+    if not isinstance(dob_str, str) or (tob_str and not isinstance(tob_str, str)):
+        # datetime.strptime raises TypeError for these
+        raise TypeError("date_of_birth and time_of_birth must be strings")
+
+    dt = _parse_date(dob_str)
+    if dt is None:
+        return None
+
+    if tob_str:
+        t = _parse_time(tob_str)
+        if t is not None:
+            dt = dt.replace(hour=t[0], minute=t[1])
+
+    return dt
+
+
+def clear_parse_cache():
+    _parse_date.cache_clear()
+    _parse_time.cache_clear()
@@ -4,7 +4,12 @@
 #
 # Tone: modern wellness + luxury (not mystical, not medical).
 
+import hashlib
+
+from bazi_core import PILLARS
+from json_fragments import EncodedDict
 from merit_engine import STEM_ELEMENT, BRANCH_ELEMENT
+from stage_timing import timed
 
 
 # ----------------------------------------
@@ -117,18 +122,10 @@ def _visual(element):
 
 
 # ----------------------------------------
-# Main Blueprint Generator
+# Blueprint Builder
 # ----------------------------------------
 
-def generate_elemental_blueprint(chart):
-    """
-    Input: chart (from compute_placeholder_bazi)
-    Output: structured blueprint JSON for frontend rendering
-    """
-
-    primary = STEM_ELEMENT.get(chart.day_master)
-    underlying = BRANCH_ELEMENT.get(chart.day.branch)
-
+def _build_blueprint(primary, underlying):
     return {
         "signature": f"{primary}-{underlying}" if primary and underlying else None,
 
@@ -145,3 +142,55 @@ def generate_elemental_blueprint(chart):
 
         "disclaimer": DISCLAIMER,
     }
+
+
+# ----------------------------------------
+# Pre-rendered Blueprints (one per day pillar)
+#
+# The blueprint depends only on the day stem + day branch, so all 60 are
+# built at import, with their JSON encoding (same settings as Flask's
+# jsonify: sorted keys, ASCII, compact) and a strong ETag.
+# ----------------------------------------
+
+class RenderedBlueprint:
+    __slots__ = ("data", "json", "etag")
+
+    def __init__(self, data: dict):
+        self.data = EncodedDict(data)
+        self.json = self.data.json.encode("ascii")
+        self.etag = hashlib.sha256(self.json).hexdigest()[:32]
+
+
+RENDERED_BLUEPRINTS = tuple(
+    RenderedBlueprint(_build_blueprint(p.stem_element, p.branch_element))
+    for p in PILLARS
+)
+
+
+@timed("blueprint")
+def get_rendered_blueprint(chart) -> RenderedBlueprint:
+    """
+    Pre-rendered blueprint for chart's day pillar.
+    .data is shared between requests — treat it as read-only.
+    """
+    day = chart.day
+    index = getattr(day, "index", None)
+    if index is not None:
+        return RENDERED_BLUEPRINTS[index]
+    return RenderedBlueprint(_build_blueprint(
+        STEM_ELEMENT.get(chart.day_master),
+        BRANCH_ELEMENT.get(day.branch),
+    ))
+
+
+# ----------------------------------------
+# Main Blueprint Generator
+# ----------------------------------------
+
+def generate_elemental_blueprint(chart):
+    """
+    Input: chart (from compute_placeholder_bazi)
+    Output: structured blueprint JSON for frontend rendering
+    (shared pre-rendered dict — treat it as read-only)
+    """
+    return get_rendered_blueprint(chart).data
@@ -0,0 +1,123 @@
+# energy_calendar_engine.py
+# Purpose: daily energy calendar: each day's pillar over a date range and
+# its relation to a day master, as compact arrays.
+#
+# Day pillars repeat every 60 days, so a range is a slice of the repeated
+# 60-day cycle, and its relations are one bytes.translate through the
+# day-master element's relation table: both arrays come out of single
+# C-level passes, however long the range. The relation row depends only
+# on the day master's element, so a rendered calendar is cached per
+# (element, start, days) and shared by every chart with that element.
+
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+
+from bazi_core import PILLARS, STEM_ELEMENT, day_pillar_index
+from current_phase_engine import RELATIONS
+from flow_timeline_engine import RELATION_ROWS, relation_row
+from json_fragments import encode_compact
+
+MAX_CALENDAR_DAYS = 3660
+CALENDAR_CACHE_SIZE = int(os.environ.get("BAZI_CALENDAR_CACHE_SIZE", "1024"))
+
+_CYCLE = bytes(range(60))
+
+# Day-master element → bytes.translate table: pillar index → RELATIONS index
+_RELATION_TABLES = {
+    element: bytes(RELATIONS.index(row[i]) for i in range(60)) + bytes(256 - 60)
+    for element, row in RELATION_ROWS.items()
+}
+
+
+def day_pillars(start: date, days: int) -> bytes:
+    """Sexagenary index of each day's pillar from start, one byte per day."""
+    first = day_pillar_index(start)
+    return (_CYCLE * ((first + days) // 60 + 1))[first:first + days]
+
+
+@dataclass(frozen=True)
+class EnergyCalendar:
+    start: date
+    pillars: bytes      # sexagenary index per day
+    relations: bytes    # RELATIONS index per day
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=len(self.pillars) - 1)
+
+
+def _energy_calendar(element: str, start: date, days: int) -> EnergyCalendar:
+    pillars = day_pillars(start, days)
+    return EnergyCalendar(start, pillars, pillars.translate(_RELATION_TABLES[element]))
+
+
+def _check_window(start: date, days: int):
+    if days > date.max.toordinal() - start.toordinal() + 1:
+        raise ValueError(f"start + days runs past {date.max.isoformat()}")
+
+
+def energy_calendar(day_master: str, start: date, days: int) -> EnergyCalendar:
+    """Pillar and relation to day_master (a heavenly stem) of `days` days from start."""
+    relation_row(day_master)
+    _check_window(start, days)
+    return _energy_calendar(STEM_ELEMENT[day_master], start, days)
+
+
+# ----------------------------------------
+# Pre-rendered calendar (/energy-calendar)
+#
+# Arrays hold indexes into the "pillars" (60 names) and "relations"
+# legends, which are encoded once.
+# ----------------------------------------
+
+_PILLAR_LEGEND_JSON = encode_compact([str(p) for p in PILLARS])
+_RELATION_LEGEND_JSON = encode_compact(list(RELATIONS))
+_DIGITS = tuple(str(i) for i in range(60))
+
+
+def _int_array(values: bytes) -> str:
+    return "[" + ",".join(map(_DIGITS.__getitem__, values)) + "]"
+
+
+class RenderedCalendar:
+    __slots__ = ("calendar", "json")
+
+    def __init__(self, calendar: EnergyCalendar):
+        self.calendar = calendar
+        # jsonify's sorted key order
+        self.json = (
+            f'{{"days":{len(calendar.pillars)},"end":"{calendar.end.isoformat()}",'
+            f'"pillar":{_int_array(calendar.pillars)},"pillars":{_PILLAR_LEGEND_JSON},'
+            f'"relation":{_int_array(calendar.relations)},"relations":{_RELATION_LEGEND_JSON},'
+            f'"start":"{calendar.start.isoformat()}"}}'
+        ).encode("ascii")
+
+    @property
+    def data(self) -> dict:
+        calendar = self.calendar
+        return {
+            "start": calendar.start.isoformat(),
+            "end": calendar.end.isoformat(),
+            "days": len(calendar.pillars),
+            "pillar": list(calendar.pillars),
+            "relation": list(calendar.relations),
+            "pillars": [str(p) for p in PILLARS],
+            "relations": list(RELATIONS),
+        }
+
+
+@lru_cache(maxsize=CALENDAR_CACHE_SIZE)
+def _rendered_calendar(element: str, start_ordinal: int, days: int) -> RenderedCalendar:
+    return RenderedCalendar(_energy_calendar(element, date.fromordinal(start_ordinal), days))
+
+
+def get_rendered_calendar(day_master: str, start: date, days: int) -> RenderedCalendar:
+    """
+    Calendar with its JSON pre-rendered; shared by all day masters of the
+    same element. Raises ValueError for a non-stem or a window past date.max.
+    """
+    relation_row(day_master)
+    _check_window(start, days)
+    return _rendered_calendar(STEM_ELEMENT[day_master], start.toordinal(), days)
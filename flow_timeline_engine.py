@@ -0,0 +1,159 @@
+# flow_timeline_engine.py
+# Purpose: 流年 / 流月 (annual and monthly flow pillar) timeline.
+#
+# A flow year runs from one 立春 to the next and a flow month from one
+# 節 to the next, so both start on every n-th solar term number (24 for
+# years, 2 for months). A timeline is therefore a range of term numbers:
+# slicing it pages in O(1), and entries are generated lazily from it.
+# Pillars are table lookups, and relations to the day master come from
+# one precomputed 60-pillar row per day-master element.
+
+from datetime import date, datetime
+from json.encoder import encode_basestring_ascii
+
+from bazi_core import PILLARS, SOLAR_TERMS, STEM_ELEMENT, month_pillar_index, solar_term_number, solar_term_start
+from current_phase_engine import ELEMENT_INDEX, RELATION_MATRIX, RELATIONS
+
+# Resolution → solar terms per entry
+RESOLUTIONS = {"year": 24, "month": 2}
+
+_FIRST_TERM = SOLAR_TERMS.first_number
+_LAST_TERM = SOLAR_TERMS.first_number + len(SOLAR_TERMS.minutes) - 1
+
+
+def _term_iso(minutes: int) -> str:
+    days, minute = divmod(minutes, 1440)
+    return f"{date.fromordinal(SOLAR_TERMS.epoch_ordinal + days).isoformat()}T{minute // 60:02d}:{minute % 60:02d}"
+
+
+# Start of every solar term in the table as entries show it (CST, minutes)
+_TERM_ISO = tuple(_term_iso(m) for m in SOLAR_TERMS.minutes)
+
+
+# ----------------------------------------
+# Relation rows
+# ----------------------------------------
+
+# Day-master element → relation of each sexagenary pillar (by its stem element)
+RELATION_ROWS = {
+    element: tuple(RELATIONS[RELATION_MATRIX[i][ELEMENT_INDEX[p.stem_element]]] for p in PILLARS)
+    for element, i in ELEMENT_INDEX.items()
+}
+
+
+def relation_row(day_master: str) -> tuple:
+    """Relation of each of the 60 pillars to day_master (a heavenly stem)."""
+    try:
+        return RELATION_ROWS[STEM_ELEMENT[day_master]]
+    except KeyError:
+        raise ValueError(f"Not a heavenly stem: {day_master!r}") from None
+
+
+# ----------------------------------------
+# Term ranges
+# ----------------------------------------
+
+def _align_down(n: int, step: int) -> int:
+    return n - n % step
+
+
+def _align_up(n: int, step: int) -> int:
+    return _align_down(n + step - 1, step)
+
+
+def flow_terms(start: datetime, end: datetime, resolution: str = "month") -> range:
+    """
+    Term numbers of the flow years / months overlapping [start, end),
+    clipped to the solar term table (1900–2100).
+    """
+    step = RESOLUTIONS[resolution]
+    lowest = _align_up(_FIRST_TERM, step)
+    highest = _align_down(_LAST_TERM - step, step)  # last entry whose end is known
+
+    n = solar_term_number(start)
+    if n is None:
+        first = lowest if start < solar_term_start(_FIRST_TERM) else highest + step
+    else:
+        first = max(lowest, _align_down(n, step))
+
+    n = solar_term_number(end)
+    if n is None:
+        stop = lowest if end < solar_term_start(_FIRST_TERM) else highest + step
+    else:
+        stop = _align_down(n, step)
+        if solar_term_start(stop) < end:
+            stop += step
+    stop = min(stop, highest + step)
+
+    return range(first, max(first, stop), step)
+
+
+def flow_pillar_index(n: int, step: int) -> int:
+    """Sexagenary index of the flow year (step 24) / month (step 2) opening at term n."""
+    year_index = (n // 24 - 4) % 60
+    if step == 24:
+        return year_index
+    return month_pillar_index(year_index, (n % 24) // 2 + 1)
+
+
+# ----------------------------------------
+# Entries
+# ----------------------------------------
+
+def iter_flow_timeline(day_master: str, terms: range):
+    """
+    Yields one dict per flow year / month in terms (see flow_terms):
+    bazi year (and month 1–12 from 寅), pillar, elements, relation of the
+    pillar to day_master, start and end (CST, minute precision).
+    """
+    row = relation_row(day_master)
+    step = terms.step
+    for n in terms:
+        p = PILLARS[flow_pillar_index(n, step)]
+        entry = {
+            "year": n // 24,
+            "pillar": str(p),
+            "stem": p.stem,
+            "branch": p.branch,
+            "stem_element": p.stem_element,
+            "branch_element": p.branch_element,
+            "relation": row[p.index],
+            "start": _TERM_ISO[n - _FIRST_TERM],
+            "end": _TERM_ISO[n + step - _FIRST_TERM],
+        }
+        if step == 2:
+            entry["month"] = (n % 24) // 2 + 1
+        yield entry
+
+
+# Pre-encoded pieces of an entry's JSON around its dynamic fields, per
+# (day-master element, pillar), in jsonify's sorted key order:
+#   branch, branch_element | end, (month) | pillar, relation | start | stem, stem_element | year
+def _entry_pieces(p, relation: str) -> tuple:
+    e = encode_basestring_ascii
+    return (
+        f'{{"branch":{e(p.branch)},"branch_element":{e(p.branch_element)},',
+        f',"pillar":{e(str(p))},"relation":{e(relation)},',
+        f',"stem":{e(p.stem)},"stem_element":{e(p.stem_element)},',
+    )
+
+
+_ENTRY_PIECES = {
+    element: tuple(_entry_pieces(p, row[p.index]) for p in PILLARS)
+    for element, row in RELATION_ROWS.items()
+}
+
+
+def iter_flow_timeline_json(day_master: str, terms: range):
+    """
+    Same entries as iter_flow_timeline, as compact JSON strings (the
+    bytes jsonify would produce), without building the dicts.
+    """
+    relation_row(day_master)
+    pieces = _ENTRY_PIECES[STEM_ELEMENT[day_master]]
+    step = terms.step
+    for n in terms:
+        head, middle, tail = pieces[flow_pillar_index(n, step)]
+        i = n - _FIRST_TERM
+        month = f',"month":{(n % 24) // 2 + 1}' if step == 2 else ""
+        yield f'{head}"end":"{_TERM_ISO[i + step]}"{month}{middle}"start":"{_TERM_ISO[i]}"{tail}"year":{n // 24}}}'
@@ -0,0 +1,114 @@
+# gunicorn.conf.py
+# Loaded automatically by gunicorn from the working directory.
+#
+# Per-worker memory with and without preloading:
+#   python -m benchmarks.worker_memory
+
+import gc
+import glob
+import os
+import random
+import shutil
+import tempfile
+
+
+def _flag(name: str, default: str = "1") -> bool:
+    return os.environ.get(name, default).lower() not in ("0", "false", "no", "off")
+
+
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# ----------------------------------------
+# Listener
+# ----------------------------------------
+bind = os.environ.get("BAZI_BIND", "0.0.0.0:5000")
+reuse_port = True
+
+
+# ----------------------------------------
+# Workers
+#
+# Requests are short and CPU-bound, so one sync worker per core (plus
+# one to cover the time workers spend on socket I/O) keeps every core
+# busy. On a single core, one gthread worker overlaps slow clients
+# instead of blocking on them. WEB_CONCURRENCY, BAZI_WORKER_CLASS and
+# BAZI_THREADS override the choice.
+# ----------------------------------------
+cpus = _cpu_count()
+worker_class = os.environ.get("BAZI_WORKER_CLASS", "sync" if cpus > 1 else "gthread")
+workers = int(os.environ.get("WEB_CONCURRENCY", cpus + 1 if cpus > 1 else 1))
+threads = int(os.environ.get("BAZI_THREADS", 1 if worker_class == "sync" else 4))
+
+
+# ----------------------------------------
+# Preload and copy-on-write
+#
+# The app, with every static table and text catalog, is imported once
+# in the master. when_ready then builds the lazily filled catalogs
+# (app.warm_up) and gc.freeze() moves everything into the permanent
+# generation right before each fork, so collections in the workers
+# never write to the inherited objects and their pages stay shared.
+# The collector is off in the master (so import leaves no freed holes
+# between long-lived objects) and re-enabled in each worker.
+# BAZI_PRELOAD=0 switches all of this off.
+# ----------------------------------------
+preload_app = _flag("BAZI_PRELOAD")
+
+if preload_app:
+    gc.disable()
+
+
+def when_ready(server):
+    if preload_app:
+        from app import warm_up
+        sizes = warm_up()
+        server.log.info("Warmed up: %s", ", ".join(f"{k}={v}" for k, v in sizes.items()))
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
+    # The random state was inherited from the master; reseed so workers
+    # do not all draw the same sequence (BAZI_PROFILE_RATE sampling)
+    random.seed()
+
+
+# ----------------------------------------
+# Shared metrics store (metrics.py)
+#
+# Workers write their Prometheus samples to mmap files here; it must be
+# set (and exist) before the app is imported, and its sample files are
+# removed on every start so counters from a previous run are not merged
+# in. Only a directory created here is deleted outright (on exit): one
+# supplied via PROMETHEUS_MULTIPROC_DIR keeps everything but the *.db files.
+# ----------------------------------------
+metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), f"bazi-metrics-{os.getpid()}"),
+)
+os.makedirs(metrics_dir, exist_ok=True)
+
+
+def on_starting(server):
+    for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid, metrics_dir)
+
+
+def on_exit(server):
+    if metrics_dir.startswith(os.path.join(tempfile.gettempdir(), "bazi-metrics-")):
+        shutil.rmtree(metrics_dir, ignore_errors=True)
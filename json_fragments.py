@@ -0,0 +1,116 @@
+# json_fragments.py
+# Purpose: JSON responses assembled from pre-encoded pieces.
+#
+# Engines that return shared, read-only results (blueprints, readings,
+# yin burden profiles) wrap them in EncodedDict, which carries its own
+# JSON encoding made once when the result is built. The Flask provider
+# below splices those encodings in instead of re-escaping their long
+# static paragraphs on every response. Output is byte-for-byte what
+# Flask's jsonify produces outside debug mode (sorted keys, ASCII
+# escapes, compact separators).
+
+import json
+from json.encoder import encode_basestring_ascii
+
+from flask.json.provider import DefaultJSONProvider
+
+COMPACT_SEPARATORS = (",", ":")
+
+# Same settings as jsonify outside debug mode
+_compact_encoder = json.JSONEncoder(ensure_ascii=True, sort_keys=True, separators=COMPACT_SEPARATORS)
+
+
+def encode_compact(obj) -> str:
+    return _compact_encoder.encode(obj)
+
+
+class EncodedDict(dict):
+    """
+    dict that carries its compact JSON encoding in .json (str).
+    Shared between requests — treat it as read-only.
+    """
+    __slots__ = ("json",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.json = encode_compact(self)
+
+
+# ----------------------------------------
+# Encoder
+# ----------------------------------------
+
+class FragmentEncoder:
+    """
+    encode(obj) == json.dumps(obj, ensure_ascii=True, sort_keys=True,
+    separators=(",", ":"), default=default), with EncodedDict values
+    spliced in from .json. Plain dicts are walked to find them; every
+    other value is encoded by the stdlib (C) encoder in one call.
+    """
+
+    def __init__(self, default=None):
+        self._leaf = json.JSONEncoder(
+            ensure_ascii=True,
+            sort_keys=True,
+            separators=COMPACT_SEPARATORS,
+            default=default,
+        ).encode
+
+    def encode(self, obj) -> str:
+        parts = []
+        self._encode(obj, parts)
+        return "".join(parts)
+
+    def _encode(self, o, parts):
+        t = type(o)
+        if t is EncodedDict:
+            parts.append(o.json)
+        elif t is dict and all(type(k) is str for k in o):
+            parts.append("{")
+            first = True
+            for k in sorted(o):
+                if first:
+                    first = False
+                else:
+                    parts.append(",")
+                parts.append(encode_basestring_ascii(k))
+                parts.append(":")
+                self._encode(o[k], parts)
+            parts.append("}")
+        else:
+            # Also dicts with non-string keys: coerced and sorted by stdlib rules
+            parts.append(self._leaf(o))
+
+
+# ----------------------------------------
+# Flask JSON providers
+# ----------------------------------------
+
+class FragmentJSONProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider using FragmentEncoder for the compact, sorted,
+    ASCII dumps jsonify does outside debug mode; any other options (e.g.
+    the debug-mode indent) go through the stdlib as before.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encoder = FragmentEncoder(default=self.default)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if (
+            kwargs.get("separators") == COMPACT_SEPARATORS
+            and kwargs.get("default", self.default) is self.default
+            and kwargs.get("ensure_ascii", self.ensure_ascii) is True
+            and kwargs.get("sort_keys", self.sort_keys) is True
+            and kwargs.keys() <= {"separators", "default", "ensure_ascii", "sort_keys"}
+        ):
+            return self._encoder.encode(obj)
+        return super().dumps(obj, **kwargs)
+
+
+# Selected with BAZI_JSON_PROVIDER (app.py)
+JSON_PROVIDERS = {
+    "fragments": FragmentJSONProvider,
+    "stdlib": DefaultJSONProvider,
+}
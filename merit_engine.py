@@ -3,6 +3,10 @@
 from datetime import datetime
 import hashlib
 
+from bazi_core import PILLARS, STEM_ELEMENT, BRANCH_ELEMENT, HOUR_PILLAR_TABLE, month_pillar_index
+from json_fragments import EncodedDict
+from stage_timing import timed
+
 # ---------------------------------------------------------
 # (A) STABLE PLACEHOLDER MERIT ENGINE (kept for /yin-burden)
 # ---------------------------------------------------------
@@ -17,6 +21,7 @@ def _stable_int_seed(namespace: str, key: str) -> int:
     return int(h[:8], 16)
 
 
+@timed("merit_debt")
 def calculate_merit_debt_profile(dob: datetime) -> dict:
     """
     TEMP VERSION:
@@ -72,24 +77,6 @@ def calculate_merit_debt_profile(dob: datetime) -> dict:
 # (B) REAL BAZI-BASED YIN BURDEN ENGINE
 # ---------------------------------------------------------
 
-# Stem → Element
-STEM_ELEMENT = {
-    "甲": "Wood", "乙": "Wood",
-    "丙": "Fire", "丁": "Fire",
-    "戊": "Earth", "己": "Earth",
-    "庚": "Metal", "辛": "Metal",
-    "壬": "Water", "癸": "Water",
-}
-
-# Branch → Element
-BRANCH_ELEMENT = {
-    "子": "Water", "亥": "Water",
-    "寅": "Wood", "卯": "Wood",
-    "巳": "Fire", "午": "Fire",
-    "申": "Metal", "酉": "Metal",
-    "辰": "Earth", "戌": "Earth", "丑": "Earth", "未": "Earth",
-}
-
 # Element psychological stories
 ELEMENT_STORIES = {
     "Wood": {
@@ -182,6 +169,69 @@ def _element_from_branch(branch: str):
     return BRANCH_ELEMENT.get(branch)
 
 
+# ---------------------------------------------------------
+# Weighted element counts as one packed int
+#
+# Each element gets an 8-bit field (counts never exceed 14), so a
+# chart's count vector is just the sum of its pillar codes. The
+# 60-entry table replaces per-pillar dict lookups, and the packed
+# vector keys the profile memo below.
+# ---------------------------------------------------------
+
+ELEMENTS = ("Wood", "Fire", "Earth", "Metal", "Water")
+_FIELD_BITS = 8
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+
+
+def _element_code(element, weight: int) -> int:
+    if element not in ELEMENTS:
+        return 0
+    return weight << (_FIELD_BITS * ELEMENTS.index(element))
+
+
+# Sexagenary pillar index → stem (weight 2) + branch (weight 1)
+PILLAR_ELEMENT_CODES = tuple(
+    _element_code(p.stem_element, 2) + _element_code(p.branch_element, 1)
+    for p in PILLARS
+)
+
+DAY_MASTER_CODES = {stem: _element_code(element, 2) for stem, element in STEM_ELEMENT.items()}
+
+
+def _pillar_code(p) -> int:
+    index = getattr(p, "index", None)
+    if index is not None:
+        return PILLAR_ELEMENT_CODES[index]
+    return (
+        _element_code(_element_from_stem(p.stem), 2)
+        + _element_code(_element_from_branch(p.branch), 1)
+    )
+
+
+def element_count_code(chart) -> int:
+    """Packed weighted five-element counts (incl. Day-Master focus)."""
+    return (
+        _pillar_code(chart.year)
+        + _pillar_code(chart.month)
+        + _pillar_code(chart.day)
+        + _pillar_code(chart.hour)
+        + DAY_MASTER_CODES.get(chart.day_master, 0)
+    )
+
+
+def _decode_element_counts(code: int) -> dict:
+    return {
+        element: (code >> (_FIELD_BITS * i)) & _FIELD_MASK
+        for i, element in enumerate(ELEMENTS)
+    }
+
+
+# Element-count code → profile (EncodedDict, so responses reuse its JSON);
+# only a few hundred distinct balances exist
+_YIN_BURDEN_PROFILES = {}
+
+
+@timed("yin_burden")
 def calculate_yin_burden_from_bazi(chart):
     """
     Turn a BaZi chart into a gentle Yin-Burden profile.
@@ -191,28 +241,44 @@ def calculate_yin_burden_from_bazi(chart):
       - Day-Master element gets extra weight (personal karma focus).
       - Imbalance (max - min) becomes symbolic karmic load.
       - More imbalance = deeper 'homework', but always framed as growth.
-    """
 
-    # -----------------------------
-    # 1) Count elements with weights
-    # -----------------------------
-    elements = {"Wood": 0, "Fire": 0, "Earth": 0, "Metal": 0, "Water": 0}
+    Profiles are memoized per element balance; the returned dict is
+    shared between charts — treat it as read-only.
+    """
+    code = element_count_code(chart)
+    profile = _YIN_BURDEN_PROFILES.get(code)
+    if profile is None:
+        profile = _YIN_BURDEN_PROFILES.setdefault(
+            code, EncodedDict(_build_yin_burden_profile(_decode_element_counts(code)))
+        )
+    return profile
 
-    pillars = [chart.year, chart.month, chart.day, chart.hour]
 
-    for p in pillars:
-        se = _element_from_stem(p.stem)
-        be = _element_from_branch(p.branch)
-        if se:
-            elements[se] += 2
-        if be:
-            elements[be] += 1
+def warm_yin_burden_profiles() -> int:
+    """
+    Build the profile for every element balance a chart can have (year +
+    month pillars × day + hour pillars), so a pre-forking server creates
+    them once before fork. Returns the number of profiles.
+    """
+    year_month = {
+        PILLAR_ELEMENT_CODES[y] + PILLAR_ELEMENT_CODES[month_pillar_index(y, m)]
+        for y in range(60)
+        for m in range(1, 13)
+    }
+    day_hour = {
+        PILLAR_ELEMENT_CODES[d]
+        + DAY_MASTER_CODES[PILLARS[d].stem]
+        + PILLAR_ELEMENT_CODES[HOUR_PILLAR_TABLE[(d % 10) * 12 + h]]
+        for d in range(60)
+        for h in range(12)
+    }
+    for code in {a + b for a in year_month for b in day_hour}:
+        if code not in _YIN_BURDEN_PROFILES:
+            _YIN_BURDEN_PROFILES[code] = EncodedDict(_build_yin_burden_profile(_decode_element_counts(code)))
+    return len(_YIN_BURDEN_PROFILES)
 
-    # Day Master focus
-    dm_elem = _element_from_stem(chart.day_master)
-    if dm_elem:
-        elements[dm_elem] += 2
 
+def _build_yin_burden_profile(elements: dict) -> dict:
     # -----------------------------
     # 2) Imbalance calculation
     # -----------------------------
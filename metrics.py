@@ -0,0 +1,135 @@
+# metrics.py
+# Purpose: Prometheus metrics behind /metrics.
+#
+# Under gunicorn every worker writes its samples to mmap-backed files in
+# PROMETHEUS_MULTIPROC_DIR (set up by gunicorn.conf.py before the workers
+# start), and a scrape served by any worker merges all of them, so one
+# scrape covers the whole instance. Without that directory (python
+# app.py) the metrics are this process's only.
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from bazi_core import chart_cache_stats
+from stage_timing import LATENCY_BUCKETS
+
+ENABLED = os.environ.get("BAZI_METRICS", "1").lower() not in ("0", "false", "no", "off")
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+# ----------------------------------------
+# Metric families
+# ----------------------------------------
+
+REQUESTS = Counter(
+    "bazi_http_requests_total",
+    "HTTP requests by endpoint, method and status code.",
+    ["endpoint", "method", "status"],
+)
+
+REQUEST_LATENCY = Histogram(
+    "bazi_http_request_duration_seconds",
+    "Time from routing to response, by endpoint.",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+
+STAGE_LATENCY = Histogram(
+    "bazi_stage_duration_seconds",
+    "Per-stage time inside a request (only with BAZI_TIMING=1).",
+    ["endpoint", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+ENGINE_ERRORS = Counter(
+    "bazi_engine_errors_total",
+    "Unhandled exceptions raised while serving a request.",
+    ["endpoint", "exception"],
+)
+
+# Cumulative per worker; summed over live workers
+CHART_CACHE = Gauge(
+    "bazi_chart_cache_events",
+    "Chart cache hits / misses / estimated evictions (misses minus entries held) since worker start.",
+    ["event"],
+    multiprocess_mode="livesum",
+)
+
+_CHART_CACHE_EVENTS = tuple(
+    (event, CHART_CACHE.labels(event)) for event in ("hits", "misses", "estimated_evictions")
+)
+
+
+# ----------------------------------------
+# Recording
+# ----------------------------------------
+
+# Workers refresh their cache gauges every this many requests (and on scrape)
+CACHE_GAUGE_INTERVAL = 100
+_requests_until_cache_update = 0
+
+
+# Labelled children, memoized (.labels() takes a lock and builds a key each call)
+_request_counters = {}
+_request_latencies = {}
+
+
+def observe_request(endpoint: str, method: str, status: int, seconds: float):
+    global _requests_until_cache_update
+    key = (endpoint, method, status)
+    counter = _request_counters.get(key)
+    if counter is None:
+        counter = _request_counters[key] = REQUESTS.labels(endpoint, method, str(status))
+    counter.inc()
+
+    latency = _request_latencies.get(endpoint)
+    if latency is None:
+        latency = _request_latencies[endpoint] = REQUEST_LATENCY.labels(endpoint)
+    latency.observe(seconds)
+
+    _requests_until_cache_update -= 1
+    if _requests_until_cache_update <= 0:
+        _requests_until_cache_update = CACHE_GAUGE_INTERVAL
+        _update_cache_gauges()
+
+
+def observe_stages(endpoint: str, stages):
+    """stages: [(stage, seconds)] from stage_timing.finish_request."""
+    for stage, seconds in stages:
+        STAGE_LATENCY.labels(endpoint, stage).observe(seconds)
+
+
+def observe_error(endpoint: str, exc: BaseException):
+    ENGINE_ERRORS.labels(endpoint, type(exc).__name__).inc()
+
+
+def _update_cache_gauges():
+    stats = chart_cache_stats()
+    for event, gauge in _CHART_CACHE_EVENTS:
+        gauge.set(stats[event])
+
+
+# ----------------------------------------
+# Exposition
+# ----------------------------------------
+
+def render():
+    """(body, content type) for a scrape."""
+    _update_cache_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
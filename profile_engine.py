@@ -0,0 +1,84 @@
+# profile_engine.py
+# Purpose: run every engine over one shared birth context (/profile).
+#
+# The birth datetime is parsed once and the chart is computed at most
+# once; sections that were not requested are never computed.
+
+from datetime import datetime
+from functools import cached_property
+
+from bazi_core import compute_placeholder_bazi, describe_bazi_chart
+from merit_engine import calculate_merit_debt_profile, calculate_yin_burden_from_bazi
+from elemental_blueprint_engine import generate_elemental_blueprint
+from current_phase_engine import get_rendered_reading_for_key, reading_key
+
+
+class ProfileContext:
+    """
+    Shared inputs for one profile; the chart is built on first use
+    unless a precomputed one (e.g. from compute_bazi_batch) is passed.
+    """
+
+    def __init__(self, birth_dt: datetime, as_of: datetime = None, chart=None, gender: str = "male"):
+        self.birth_dt = birth_dt
+        self.as_of = as_of
+        self.gender = gender
+        if chart is not None:
+            self.chart = chart
+
+    @cached_property
+    def chart(self):
+        return compute_placeholder_bazi(self.birth_dt)
+
+    @cached_property
+    def reading_key(self) -> tuple:
+        """Current-phase reading key (set as_of first); shared by the ETag and the section."""
+        return reading_key(self.chart, self.birth_dt, self.as_of, self.gender)
+
+
+# ----------------------------------------
+# Section pipeline (response order)
+# ----------------------------------------
+
+SECTION_BUILDERS = {
+    "bazi_chart": lambda ctx: describe_bazi_chart(ctx.chart),
+    "blueprint": lambda ctx: generate_elemental_blueprint(ctx.chart),
+    "yin_burden": lambda ctx: calculate_yin_burden_from_bazi(ctx.chart),
+    "merit_debt": lambda ctx: calculate_merit_debt_profile(ctx.birth_dt),
+    "current_phase": lambda ctx: get_rendered_reading_for_key(ctx.reading_key).data,
+}
+
+PROFILE_SECTIONS = tuple(SECTION_BUILDERS)
+
+# Sections computed from the chart (merit_debt only needs the birth datetime)
+CHART_SECTIONS = ("bazi_chart", "blueprint", "yin_burden", "current_phase")
+
+
+def parse_sections(value) -> tuple:
+    """
+    None / "" → all sections.
+    Accepts a list of names or a comma-separated string; raises
+    ValueError on any other type and on unknown names.
+    """
+    if value is None:
+        return PROFILE_SECTIONS
+    if isinstance(value, str):
+        names = value.split(",")
+    elif isinstance(value, (list, tuple)) and all(isinstance(n, str) for n in value):
+        names = value
+    else:
+        raise ValueError("sections must be a comma-separated string or a list of section names")
+
+    names = {n.strip() for n in names if n.strip()}
+    if not names:
+        return PROFILE_SECTIONS
+
+    unknown = sorted(names - set(SECTION_BUILDERS))
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+
+    return tuple(s for s in PROFILE_SECTIONS if s in names)
+
+
+def build_profile(ctx: ProfileContext, sections=PROFILE_SECTIONS) -> dict:
+    return {name: SECTION_BUILDERS[name](ctx) for name in sections}
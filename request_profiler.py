@@ -0,0 +1,230 @@
+# request_profiler.py
+# Purpose: opt-in profiling of live requests, aggregated per endpoint.
+#
+# A request is profiled when it carries X-Bazi-Profile: <BAZI_ADMIN_TOKEN>,
+# or at random with probability BAZI_PROFILE_RATE. BAZI_PROFILE_MODE picks
+# cProfile ("cprofile": exact call counts, pstats output) or a stack
+# sampler ("sample": collapsed stacks for flame graphs, lower overhead).
+# With neither a rate nor a token configured, app.py registers no hooks.
+# Stats are per worker process.
+
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+RATE = float(os.environ.get("BAZI_PROFILE_RATE", "0") or 0)
+ADMIN_TOKEN = os.environ.get("BAZI_ADMIN_TOKEN", "")
+MODE = os.environ.get("BAZI_PROFILE_MODE", "cprofile")
+SAMPLE_INTERVAL = float(os.environ.get("BAZI_PROFILE_INTERVAL", "0.001"))
+
+PROFILE_HEADER = "X-Bazi-Profile"
+ADMIN_HEADER = "X-Admin-Token"
+MODES = ("cprofile", "sample")
+
+ENABLED = RATE > 0 or bool(ADMIN_TOKEN)
+
+if MODE not in MODES:
+    raise ValueError(f"BAZI_PROFILE_MODE must be one of {', '.join(MODES)}")
+
+
+def is_admin(token) -> bool:
+    # Bytes: compare_digest rejects non-ASCII str
+    return bool(ADMIN_TOKEN) and bool(token) and hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def should_profile(header_value) -> bool:
+    return is_admin(header_value) or (RATE > 0 and random.random() < RATE)
+
+
+# ----------------------------------------
+# Aggregated results (per endpoint)
+# ----------------------------------------
+
+_lock = threading.Lock()
+_requests = Counter()
+_pstats = {}
+_stacks = {}
+
+
+def reset():
+    with _lock:
+        _requests.clear()
+        _pstats.clear()
+        _stacks.clear()
+
+
+def summary() -> dict:
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "mode": MODE,
+            "rate": RATE,
+            "profiled_requests": dict(_requests),
+        }
+
+
+def _combined_pstats(endpoint=None):
+    with _lock:
+        selected = [s for e, s in _pstats.items() if endpoint is None or e == endpoint]
+        if not selected:
+            return None
+        combined = pstats.Stats()
+        combined.add(*selected)
+        return combined
+
+
+def pstats_text(endpoint=None, sort: str = "cumulative", limit: int = 50) -> str:
+    """pstats report (print_stats) for one endpoint or all of them."""
+    stats = _combined_pstats(endpoint)
+    if stats is None:
+        return ""
+    out = io.StringIO()
+    stats.stream = out
+    stats.sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def pstats_dump(endpoint=None) -> bytes:
+    """Same bytes as pstats.Stats.dump_stats(); load with pstats.Stats(path)."""
+    stats = _combined_pstats(endpoint)
+    return marshal.dumps(stats.stats if stats is not None else {})
+
+
+def collapsed_stacks(endpoint=None) -> str:
+    """Sampled stacks as "frame;frame;frame count" lines (flamegraph.pl / speedscope)."""
+    with _lock:
+        total = Counter()
+        for e, stacks in _stacks.items():
+            if endpoint is None or e == endpoint:
+                total.update(stacks)
+    return "".join(f"{stack} {count}\n" for stack, count in total.most_common())
+
+
+# ----------------------------------------
+# Profiling sessions
+# ----------------------------------------
+
+class _CProfileSession:
+    __slots__ = ("endpoint", "profile")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def finish(self):
+        self.profile.disable()
+        stats = pstats.Stats(self.profile)
+        with _lock:
+            _requests[self.endpoint] += 1
+            existing = _pstats.get(self.endpoint)
+            if existing is None:
+                _pstats[self.endpoint] = stats
+            else:
+                existing.add(stats)
+
+
+class _SampleSession:
+    __slots__ = ("endpoint", "thread_id")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.thread_id = threading.get_ident()
+        _sampler.watch(self.thread_id, endpoint)
+
+    def finish(self):
+        _sampler.unwatch(self.thread_id)
+        with _lock:
+            _requests[self.endpoint] += 1
+
+
+def start(endpoint: str):
+    """Begin profiling the current request; None if a profiler is already active."""
+    try:
+        if MODE == "sample":
+            return _SampleSession(endpoint)
+        return _CProfileSession(endpoint)
+    except ValueError:
+        # Another profiler / monitoring tool owns this thread
+        return None
+
+
+# ----------------------------------------
+# Stack sampler
+# ----------------------------------------
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    One daemon thread (started on first use, so after any fork) that
+    samples the stacks of watched request threads every `interval`
+    seconds, and sleeps on an event while nothing is watched.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._watched = {}
+        self._guard = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._saved_switch_interval = None
+
+    def watch(self, thread_id: int, endpoint: str):
+        with self._guard:
+            if not self._watched:
+                # The sampler needs the GIL at least once per interval,
+                # not only when the request thread blocks on I/O; the
+                # previous interval is restored once nothing is watched
+                self._saved_switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(self._saved_switch_interval, self.interval))
+            self._watched[thread_id] = endpoint
+            self._wake.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, thread_id: int):
+        with self._guard:
+            self._watched.pop(thread_id, None)
+            if not self._watched:
+                self._wake.clear()
+                if self._saved_switch_interval is not None:
+                    sys.setswitchinterval(self._saved_switch_interval)
+                    self._saved_switch_interval = None
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._guard:
+                watched = list(self._watched.items())
+            if not watched:
+                continue
+            frames = sys._current_frames()
+            samples = [
+                (endpoint, _collapse(frames[thread_id]))
+                for thread_id, endpoint in watched
+                if thread_id in frames
+            ]
+            with _lock:
+                for endpoint, stack in samples:
+                    _stacks.setdefault(endpoint, Counter())[stack] += 1
+
+
+_sampler = StackSampler(SAMPLE_INTERVAL)
@@ -0,0 +1,113 @@
+# reverse_lookup_engine.py
+# Purpose: reverse chart lookup: every birth datetime range (1900–2100)
+# whose chart has given year, month, day and (optionally) hour pillars.
+#
+# A (year pillar, month pillar) pair names one solar month per 60 years,
+# so an index maps each pair to its few minute spans (節 to 節). Within
+# a span the day pillar recurs every 60 days, so it holds at most one
+# matching day, found from the day pillar's offsets in the calendar
+# table. The hour pillar then fixes one two-hour slot (五鼠遁 from the
+# day stem), or the whole day when the hour is unknown. Windows are
+# clipped to the span, so results agree with compute_placeholder_bazi
+# to the minute.
+
+from datetime import datetime, timedelta
+
+from bazi_core import (
+    CALENDAR_END,
+    CALENDAR_START,
+    DAY_PILLAR_TABLE,
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    HOUR_PILLAR_TABLE,
+    SOLAR_TERMS,
+    BaziChart,
+    Pillar,
+)
+from flow_timeline_engine import flow_pillar_index
+
+_EPOCH = datetime.fromordinal(SOLAR_TERMS.epoch_ordinal)
+
+# Calendar table range in solar term table minutes: [_FIRST_MINUTE, _END_MINUTE)
+_FIRST_MINUTE = (CALENDAR_START.toordinal() - SOLAR_TERMS.epoch_ordinal) * 1440
+_END_MINUTE = (CALENDAR_END.toordinal() + 1 - SOLAR_TERMS.epoch_ordinal) * 1440
+
+# Hour slot (子 = 0) → its windows within a calendar day, in minutes;
+# 子 covers the first and the last hour of the day (same day pillar)
+_SLOT_WINDOWS = ((0, 60), (1380, 1440)), *(((120 * h - 60, 120 * h + 60),) for h in range(1, 12))
+_WHOLE_DAY = ((0, 1440),)
+
+
+def parse_pillar(text) -> Pillar:
+    """"甲子" → Pillar; raises ValueError on anything else."""
+    text = str(text).strip()
+    if len(text) != 2 or text[0] not in HEAVENLY_STEMS or text[1] not in EARTHLY_BRANCHES:
+        raise ValueError(f"Not a sexagenary pillar: {text!r}")
+    return Pillar(text[0], text[1])
+
+
+# ----------------------------------------
+# Indexes
+# ----------------------------------------
+
+def _build_month_index() -> dict:
+    index = {}
+    minutes = SOLAR_TERMS.minutes
+    first = SOLAR_TERMS.first_number
+    for i in range(first % 2, len(minutes) - 2, 2):   # every 節 whose month end is known
+        n = first + i
+        start = max(minutes[i], _FIRST_MINUTE)
+        end = min(minutes[i + 2], _END_MINUTE)
+        if start < end:
+            key = ((n // 24 - 4) % 60, flow_pillar_index(n, 2))
+            index.setdefault(key, []).append((start, end))
+    return {key: tuple(spans) for key, spans in index.items()}
+
+
+# (year pillar, month pillar) → minute spans of the solar months they name
+MONTH_SPANS = _build_month_index()
+
+# Day pillar → offsets (days since CALENDAR_START) of the days it falls on
+DAY_OFFSETS = tuple(range(DAY_PILLAR_TABLE.index(p), len(DAY_PILLAR_TABLE), 60) for p in range(60))
+
+_DAY_BASE = CALENDAR_START.toordinal() - SOLAR_TERMS.epoch_ordinal
+
+
+# ----------------------------------------
+# Lookup
+# ----------------------------------------
+
+def find_birth_windows(year: Pillar, month: Pillar, day: Pillar, hour: Pillar = None) -> list:
+    """
+    [(start, end)) datetime ranges, in order, of every birth time in the
+    calendar table range whose chart has these pillars; hour=None
+    matches any hour (whole days).
+    """
+    spans = MONTH_SPANS.get((year.index, month.index), ())
+    if hour is None:
+        windows = _WHOLE_DAY
+    else:
+        slot = hour.index % 12
+        if HOUR_PILLAR_TABLE[(day.index % 10) * 12 + slot] != hour.index:
+            return []
+        windows = _SLOT_WINDOWS[slot]
+
+    offsets = DAY_OFFSETS[day.index]
+    found = []
+    for start, end in spans:
+        first = start // 1440 - _DAY_BASE
+        stop = (end - 1) // 1440 + 1 - _DAY_BASE
+        first += (offsets.start - first) % 60
+        for offset in range(first, stop, 60):
+            midnight = (offset + _DAY_BASE) * 1440
+            for a, b in windows:
+                a = max(midnight + a, start)
+                b = min(midnight + b, end)
+                if a < b:
+                    found.append((_EPOCH + timedelta(minutes=a), _EPOCH + timedelta(minutes=b)))
+    return found
+
+
+def find_chart_windows(chart: BaziChart) -> list:
+    """find_birth_windows for all four pillars of chart."""
+    return find_birth_windows(chart.year, chart.month, chart.day, chart.hour)
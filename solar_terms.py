@@ -0,0 +1,286 @@
+# solar_terms.py
+# Purpose: 24 solar terms (节气) to the minute for 1900–2100.
+#
+# The astronomy (truncated VSOP87 solar longitude, Meeus ch. 25/32) runs
+# offline: `python solar_terms.py` writes solar_terms.bin, and workers only
+# memory-map that file at import.
+#
+# All times are China Standard Time (UTC+8) civil minutes, the same
+# convention as the old LI_CHUN_DATES table.
+
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+
+
+# Term order starts at 立春 (solar longitude 315°); even ids are the
+# 12 節 that open a solar month, odd ids are the 中气.
+SOLAR_TERM_NAMES = [
+    "立春", "雨水", "惊蛰", "春分", "清明", "谷雨",
+    "立夏", "小满", "芒种", "夏至", "小暑", "大暑",
+    "立秋", "处暑", "白露", "秋分", "寒露", "霜降",
+    "立冬", "小雪", "大雪", "冬至", "小寒", "大寒",
+]
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+# Table runs from 大雪 of FIRST_YEAR - 1 (so 1 Jan FIRST_YEAR already has its
+# month) to 立春 of LAST_YEAR + 1.
+_FIRST_TERM_ID = 20  # 大雪
+_LAST_TERM_ID = 0    # 立春
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solar_terms.bin")
+
+# Header: magic, first absolute term number, epoch ordinal, entry count
+_MAGIC = b"JIEQI001"
+_HEADER = struct.Struct("<8sIII")
+
+_UTC_OFFSET_MINUTES = 8 * 60
+_J2000 = 2451545.0
+_JD_ORDINAL_OFFSET = 1721424.5  # JD of date.toordinal() day at 00:00
+
+
+# ----------------------------------------
+# VSOP87 Earth heliocentric longitude / radius (Meeus, Appendix III)
+# (amplitude, phase, frequency) per series, tau in Julian millennia
+# ----------------------------------------
+
+_L0 = [
+    (175347046, 0, 0), (3341656, 4.6692568, 6283.07585), (34894, 4.6261, 12566.1517),
+    (3497, 2.7441, 5753.3849), (3418, 2.8289, 3.5231), (3136, 3.6277, 77713.7715),
+    (2676, 4.4181, 7860.4194), (2343, 6.1352, 3930.2097), (1324, 0.7425, 11506.7698),
+    (1273, 2.0371, 529.691), (1199, 1.1096, 1577.3435), (990, 5.233, 5884.927),
+    (902, 2.045, 26.298), (857, 3.508, 398.149), (780, 1.179, 5223.694),
+    (753, 2.533, 5507.553), (505, 4.583, 18849.228), (492, 4.205, 775.523),
+    (357, 2.92, 0.067), (317, 5.849, 11790.629), (284, 1.899, 796.298),
+    (271, 0.315, 10977.079), (243, 0.345, 5486.778), (206, 4.806, 2544.314),
+    (205, 1.869, 5573.143), (202, 2.458, 6069.777), (156, 0.833, 213.299),
+    (132, 3.411, 2942.463), (126, 1.083, 20.775), (115, 0.645, 0.98),
+    (103, 0.636, 4694.003), (102, 0.976, 15720.839), (102, 4.267, 7.114),
+    (99, 6.21, 2146.17), (98, 0.68, 155.42), (86, 5.98, 161000.69),
+    (85, 1.3, 6275.96), (85, 3.67, 71430.7), (80, 1.81, 17260.15),
+    (79, 3.04, 12036.46), (75, 1.76, 5088.63), (74, 3.5, 3154.69),
+    (74, 4.68, 801.82), (70, 0.83, 9437.76), (62, 3.98, 8827.39),
+    (61, 1.82, 7084.9), (57, 2.78, 6286.6), (56, 4.39, 14143.5),
+    (56, 3.47, 6279.55), (52, 0.19, 12139.55), (52, 1.33, 1748.02),
+    (51, 0.28, 5856.48), (49, 0.49, 1194.45), (41, 5.37, 8429.24),
+    (41, 2.4, 19651.05), (39, 6.17, 10447.39), (37, 6.04, 10213.29),
+    (37, 2.57, 1059.38), (36, 1.71, 2352.87), (36, 1.78, 6812.77),
+    (33, 0.59, 17789.85), (30, 0.44, 83996.85), (30, 2.74, 1349.87),
+    (25, 3.16, 4690.48),
+]
+
+_L1 = [
+    (628331966747, 0, 0), (206059, 2.678235, 6283.07585), (4303, 2.6351, 12566.1517),
+    (425, 1.59, 3.523), (119, 5.796, 26.298), (109, 2.966, 1577.344),
+    (93, 2.59, 18849.23), (72, 1.14, 529.69), (68, 1.87, 398.15),
+    (67, 4.41, 5507.55), (59, 2.89, 5223.69), (56, 2.17, 155.42),
+    (45, 0.4, 796.3), (36, 0.47, 775.52), (29, 2.65, 7.11),
+    (21, 5.34, 0.98), (19, 1.85, 5486.78), (19, 4.97, 213.3),
+    (17, 2.99, 6275.96), (16, 0.03, 2544.31), (16, 1.43, 2146.17),
+    (15, 1.21, 10977.08), (12, 2.83, 1748.02), (12, 3.26, 5088.63),
+    (12, 5.27, 1194.45), (12, 2.08, 4694.0), (11, 0.77, 553.57),
+    (10, 1.3, 6286.6), (10, 4.24, 1349.87), (9, 2.7, 242.73),
+    (9, 5.64, 951.72), (8, 5.3, 2352.87), (6, 2.65, 9437.76),
+    (6, 4.67, 4690.48),
+]
+
+_L2 = [
+    (52919, 0, 0), (8720, 1.0721, 6283.0758), (309, 0.867, 12566.152),
+    (27, 0.05, 3.52), (16, 5.19, 26.3), (16, 3.68, 155.42),
+    (10, 0.76, 18849.23), (9, 2.06, 77713.77), (7, 0.83, 775.52),
+    (5, 4.66, 1577.34), (4, 1.03, 7.11), (4, 3.44, 5573.14),
+    (3, 5.14, 796.3), (3, 6.05, 5507.55), (3, 1.19, 242.73),
+    (3, 6.12, 529.69), (3, 0.31, 398.15), (3, 2.28, 553.57),
+    (2, 4.38, 5223.69), (2, 3.75, 0.98),
+]
+
+_L3 = [
+    (289, 5.844, 6283.076), (35, 0, 0), (17, 5.49, 12566.15),
+    (3, 5.2, 155.42), (1, 4.72, 3.52), (1, 5.3, 18849.23),
+    (1, 5.97, 242.73),
+]
+
+_L4 = [(114, 3.142, 0), (8, 4.13, 6283.08), (1, 3.84, 12566.15)]
+
+_L5 = [(1, 3.14, 0)]
+
+_R0 = [
+    (100013989, 0, 0), (1670700, 3.0984635, 6283.07585), (13956, 3.05525, 12566.1517),
+    (3084, 5.1985, 77713.7715), (1628, 1.1739, 5753.3849), (1576, 2.8469, 7860.4194),
+]
+
+_R1 = [(103019, 1.10749, 6283.07585), (1721, 1.0644, 12566.1517)]
+
+
+def _series(terms, tau):
+    return sum(a * math.cos(b + c * tau) for a, b, c in terms)
+
+
+def _delta_t_seconds(year: float) -> float:
+    """TT - UT (Espenak & Meeus polynomial fits)."""
+    if year < 1920:
+        t = year - 1900
+        return -2.79 + 1.494119 * t - 0.0598939 * t ** 2 + 0.0061966 * t ** 3 - 0.000197 * t ** 4
+    if year < 1941:
+        t = year - 1920
+        return 21.20 + 0.84493 * t - 0.0761 * t ** 2 + 0.0020936 * t ** 3
+    if year < 1961:
+        t = year - 1950
+        return 29.07 + 0.407 * t - t ** 2 / 233 + t ** 3 / 2547
+    if year < 1986:
+        t = year - 1975
+        return 45.45 + 1.067 * t - t ** 2 / 260 - t ** 3 / 718
+    if year < 2005:
+        t = year - 2000
+        return (
+            63.86 + 0.3345 * t - 0.060374 * t ** 2 + 0.0017275 * t ** 3
+            + 0.000651814 * t ** 4 + 0.00002373599 * t ** 5
+        )
+    if year < 2050:
+        t = year - 2000
+        return 62.92 + 0.32217 * t + 0.005589 * t ** 2
+    return -20 + 32 * ((year - 1820) / 100) ** 2 - 0.5628 * (2150 - year)
+
+
+def apparent_solar_longitude(jde: float) -> float:
+    """Apparent geocentric longitude of the Sun in degrees (0..360)."""
+    tau = (jde - _J2000) / 365250
+    big_t = tau * 10
+
+    lon = (
+        _series(_L0, tau)
+        + _series(_L1, tau) * tau
+        + _series(_L2, tau) * tau ** 2
+        + _series(_L3, tau) * tau ** 3
+        + _series(_L4, tau) * tau ** 4
+        + _series(_L5, tau) * tau ** 5
+    ) / 1e8
+    radius = (_series(_R0, tau) + _series(_R1, tau) * tau) / 1e8
+
+    sun = math.degrees(lon) + 180
+
+    # FK5 correction
+    sun -= 0.09033 / 3600
+
+    # Nutation in longitude (low-precision, Meeus ch. 22)
+    omega = math.radians(125.04452 - 1934.136261 * big_t)
+    l_sun = math.radians(280.4665 + 36000.7698 * big_t)
+    l_moon = math.radians(218.3165 + 481267.8813 * big_t)
+    nutation = (
+        -17.20 * math.sin(omega) - 1.32 * math.sin(2 * l_sun)
+        - 0.23 * math.sin(2 * l_moon) + 0.21 * math.sin(2 * omega)
+    )
+
+    # Aberration
+    aberration = -20.4898 / radius
+
+    return (sun + (nutation + aberration) / 3600) % 360
+
+
+def _term_jde(longitude: float, guess_jde: float) -> float:
+    jde = guess_jde
+    for _ in range(20):
+        diff = (longitude - apparent_solar_longitude(jde) + 180) % 360 - 180
+        step = diff * 365.2422 / 360
+        jde += step
+        if abs(step) < 1e-7:
+            break
+    return jde
+
+
+def _jde_to_local_minutes(jde: float, epoch_ordinal: int) -> int:
+    year = 2000 + (jde - _J2000) / 365.25
+    jd_ut = jde - _delta_t_seconds(year) / 86400
+    minutes = (jd_ut - _JD_ORDINAL_OFFSET - epoch_ordinal) * 1440 + _UTC_OFFSET_MINUTES
+    return round(minutes)
+
+
+# ----------------------------------------
+# Table generation (offline)
+# ----------------------------------------
+
+def build_table(first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR):
+    """
+    Returns (first_term_number, epoch_ordinal, minutes array).
+
+    Entry i is term number first_term_number + i, where
+    term_number = 24 * bazi_year + term id (立春 = 0). Each value is
+    CST minutes since epoch_ordinal 00:00.
+    """
+    epoch_ordinal = date(first_year - 1, 1, 1).toordinal()
+    first_number = 24 * (first_year - 1) + _FIRST_TERM_ID
+    last_number = 24 * (last_year + 1) + _LAST_TERM_ID
+
+    minutes = array("I")
+    # 立春 falls near 4 Feb; later terms follow about every 15.2 days
+    jde = date(first_year - 1, 2, 4).toordinal() + _JD_ORDINAL_OFFSET + _FIRST_TERM_ID * 15.22
+    for number in range(first_number, last_number + 1):
+        longitude = (315 + 15 * (number % 24)) % 360
+        jde = _term_jde(longitude, jde)
+        minutes.append(_jde_to_local_minutes(jde, epoch_ordinal))
+        jde += 15.22
+
+    return first_number, epoch_ordinal, minutes
+
+
+def write_table(path: str = TABLE_PATH):
+    first_number, epoch_ordinal, minutes = build_table()
+    if sys.byteorder != "little":
+        minutes.byteswap()
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, first_number, epoch_ordinal, len(minutes)))
+        f.write(minutes.tobytes())
+
+
+# ----------------------------------------
+# Runtime loading
+# ----------------------------------------
+
+class SolarTermTable:
+    """
+    Sorted term start times, memory-mapped from solar_terms.bin.
+
+    minutes[i] is the CST minute (since epoch_ordinal 00:00) at which
+    term number first_number + i begins.
+    """
+
+    def __init__(self, first_number: int, epoch_ordinal: int, minutes):
+        self.first_number = first_number
+        self.epoch_ordinal = epoch_ordinal
+        self.minutes = minutes
+
+    @classmethod
+    def load(cls, path: str = TABLE_PATH):
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, first_number, epoch_ordinal, count = _HEADER.unpack_from(buf)
+        if magic != _MAGIC or len(buf) != _HEADER.size + 4 * count:
+            raise ValueError(f"Corrupt solar term table: {path}")
+
+        minutes = memoryview(buf)[_HEADER.size:].cast("I")
+        if sys.byteorder != "little":
+            minutes = array("I", minutes)
+            minutes.byteswap()
+        return cls(first_number, epoch_ordinal, minutes)
+
+    @classmethod
+    def build(cls):
+        return cls(*build_table())
+
+    def local_minutes(self, dt: datetime) -> int:
+        return (dt.toordinal() - self.epoch_ordinal) * 1440 + dt.hour * 60 + dt.minute
+
+    def term_start(self, i: int) -> datetime:
+        return datetime.fromordinal(self.epoch_ordinal) + timedelta(minutes=self.minutes[i])
+
+
+if __name__ == "__main__":
+    write_table()
+    table = SolarTermTable.load()
+    print(f"Wrote {len(table.minutes)} solar terms to {TABLE_PATH}")
@@ -0,0 +1,143 @@
+# stage_timing.py
+# Purpose: per-request stage timings (Server-Timing header) and in-process
+# latency histograms per endpoint and stage.
+#
+# Enabled per environment with BAZI_TIMING=1. When disabled, timed()
+# returns the function it decorates unchanged, so the engines' hooks
+# cost nothing.
+
+import os
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+ENABLED = os.environ.get("BAZI_TIMING", "0").lower() in ("1", "true", "yes", "on")
+
+# Histogram upper bounds in seconds (last bucket: +Inf)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0,
+)
+
+
+# ----------------------------------------
+# Per-request recording
+# ----------------------------------------
+
+class StageRecorder:
+    """Stage → (total seconds, calls) for one request, in first-seen order."""
+    __slots__ = ("started", "stages", "active")
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.stages = {}
+        self.active = set()
+
+    def add(self, stage: str, seconds: float):
+        total, calls = self.stages.get(stage, (0.0, 0))
+        self.stages[stage] = (total + seconds, calls + 1)
+
+
+_recorder: ContextVar = ContextVar("stage_recorder", default=None)
+
+
+def timed(stage: str):
+    """
+    Decorator: add the call's duration to `stage` for the current request.
+    Nested calls to the same stage are counted once (outermost).
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            rec = _recorder.get()
+            if rec is None or stage in rec.active:
+                return fn(*args, **kwargs)
+            rec.active.add(stage)
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                rec.add(stage, perf_counter() - t0)
+                rec.active.discard(stage)
+
+        return wrapper
+
+    return decorate
+
+
+def start_request():
+    """Start recording for the current request (no-op when disabled)."""
+    if ENABLED:
+        _recorder.set(StageRecorder())
+
+
+def finish_request(endpoint: str):
+    """
+    Stop recording; feed the histograms and return [(stage, seconds)]
+    ending with ("total", request seconds). [] when not recording.
+    """
+    rec = _recorder.get()
+    if rec is None:
+        return []
+    _recorder.set(None)
+
+    stages = [(stage, seconds) for stage, (seconds, _) in rec.stages.items()]
+    stages.append(("total", perf_counter() - rec.started))
+
+    with _lock:
+        for stage, seconds in stages:
+            hist = _histograms.get((endpoint, stage))
+            if hist is None:
+                hist = _histograms[(endpoint, stage)] = LatencyHistogram()
+            hist.observe(seconds)
+
+    return stages
+
+
+def server_timing_header(stages) -> str:
+    """Server-Timing value; durations in milliseconds."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in stages)
+
+
+# ----------------------------------------
+# Histograms
+# ----------------------------------------
+
+class LatencyHistogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def histogram_snapshot() -> dict:
+    """(endpoint, stage) → {"counts": [...], "sum": s, "count": n}; counts per LATENCY_BUCKETS + Inf."""
+    with _lock:
+        return {
+            key: {"counts": list(h.counts), "sum": h.sum, "count": h.count}
+            for key, h in _histograms.items()
+        }
+
+
+def reset_histograms():
+    with _lock:
+        _histograms.clear()